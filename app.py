@@ -1,25 +1,308 @@
-from flask import Flask, render_template, request, redirect, url_for
+from flask import Flask, render_template, request, redirect, url_for, jsonify
+from flask import Response, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import text
 from sqlalchemy.orm import aliased
+from sqlalchemy.orm import Session
+from sqlalchemy import inspect
 from sqlalchemy.sql import func
 from sqlalchemy import case
-from datetime import datetime
+from sqlalchemy import select, literal, tuple_, or_, and_, type_coerce
+from datetime import datetime, timedelta
+from collections import OrderedDict
 from flask import flash
+from flask import g, has_request_context, before_render_template, template_rendered
 from sqlalchemy import event
 import enum
-from sqlalchemy import DDL
-from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy import bindparam
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+import sqlite3
+import click
+import csv
+import hashlib
+import json
+import io
+import os
+import random
+import smtplib
+import threading
+import urllib.request
+import uuid
+import logging
+from collections import deque
+import time
 
 
 
 # Create a Flask application
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///cs348.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///cs348.db')
 app.config['SECRET_KEY'] = 'secret-key'
+# Seconds a cached club/room list may be served before it is reloaded
+app.config['REFERENCE_CACHE_TTL'] = int(os.environ.get('REFERENCE_CACHE_TTL', 300))
+# Number of generated reports kept in the report result cache, and seconds one
+# may be served before it is regenerated
+app.config['REPORT_CACHE_SIZE'] = int(os.environ.get('REPORT_CACHE_SIZE', 256))
+app.config['REPORT_CACHE_TTL'] = int(os.environ.get('REPORT_CACHE_TTL', 300))
+# Longest meeting accepted, which also bounds how far back the room overlap
+# check has to look in the (room_id, start_at) index
+app.config['MAX_MEETING_MINUTES'] = int(os.environ.get('MAX_MEETING_MINUTES', 24 * 60))
+
+# Logging replaces the old per-action print() calls. Actions log at INFO and
+# form dumps at DEBUG, so the default WARNING keeps the request path quiet.
+app.config['LOG_LEVEL'] = os.environ.get('LOG_LEVEL', 'WARNING').upper()
+# Requests issuing more statements or taking longer than these budgets are
+# logged with their slowest statements; 0 turns a budget off
+app.config['QUERY_BUDGET'] = int(os.environ.get('QUERY_BUDGET', 0))
+app.config['LATENCY_BUDGET_MS'] = float(os.environ.get('LATENCY_BUDGET_MS', 0))
+# Seconds a stored Idempotency-Key response is replayed to retries
+app.config['IDEMPOTENCY_KEY_TTL'] = int(os.environ.get('IDEMPOTENCY_KEY_TTL', 24 * 60 * 60))
+
+# Invitation notifications are queued in an outbox and delivered by a background
+# worker through NOTIFICATION_BACKEND: log (the default, for local runs), smtp or
+# webhook. The worker claims NOTIFICATION_BATCH_SIZE rows at a time, sends up to
+# NOTIFICATION_CONCURRENCY at once and retries failures with exponential backoff
+# until NOTIFICATION_MAX_ATTEMPTS, after which a row is dead-lettered.
+app.config['NOTIFICATION_BACKEND'] = os.environ.get('NOTIFICATION_BACKEND', 'log').lower()
+app.config['NOTIFICATION_WORKER'] = os.environ.get('NOTIFICATION_WORKER', '1') != '0'
+app.config['NOTIFICATION_BATCH_SIZE'] = int(os.environ.get('NOTIFICATION_BATCH_SIZE', 50))
+app.config['NOTIFICATION_CONCURRENCY'] = int(os.environ.get('NOTIFICATION_CONCURRENCY', 4))
+app.config['NOTIFICATION_MAX_ATTEMPTS'] = int(os.environ.get('NOTIFICATION_MAX_ATTEMPTS', 5))
+app.config['NOTIFICATION_BACKOFF_SECONDS'] = float(os.environ.get('NOTIFICATION_BACKOFF_SECONDS', 5))
+app.config['NOTIFICATION_BACKOFF_MAX_SECONDS'] = float(os.environ.get('NOTIFICATION_BACKOFF_MAX_SECONDS', 3600))
+app.config['NOTIFICATION_POLL_SECONDS'] = float(os.environ.get('NOTIFICATION_POLL_SECONDS', 1))
+# A claimed row becomes due again after the lease, in case its worker died
+app.config['NOTIFICATION_LEASE_SECONDS'] = int(os.environ.get('NOTIFICATION_LEASE_SECONDS', 300))
+app.config['NOTIFICATION_TIMEOUT_SECONDS'] = float(os.environ.get('NOTIFICATION_TIMEOUT_SECONDS', 10))
+app.config['NOTIFICATION_WEBHOOK_URL'] = os.environ.get('NOTIFICATION_WEBHOOK_URL', 'http://127.0.0.1:8025/notifications')
+app.config['SMTP_HOST'] = os.environ.get('SMTP_HOST', 'localhost')
+app.config['SMTP_PORT'] = int(os.environ.get('SMTP_PORT', 1025))
+app.config['SMTP_FROM'] = os.environ.get('SMTP_FROM', 'clubhub@localhost')
+
+logger = logging.getLogger('clubhub')
+if not logger.handlers:
+    log_handler = logging.StreamHandler()
+    log_handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s %(message)s'))
+    logger.addHandler(log_handler)
+    logger.propagate = False
+logger.setLevel(app.config['LOG_LEVEL'])
+
+# SQLite tuning applied to every new connection, overridable from the environment.
+# SQLITE_TUNING=0 falls back to the driver defaults (rollback journal, no pool).
+app.config['SQLITE_TUNING'] = os.environ.get('SQLITE_TUNING', '1') != '0'
+app.config['SQLITE_JOURNAL_MODE'] = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL').upper()
+app.config['SQLITE_SYNCHRONOUS'] = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL').upper()
+# Negative cache_size is in KiB, so -65536 is a 64 MiB page cache per connection
+app.config['SQLITE_CACHE_SIZE'] = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))
+app.config['SQLITE_MMAP_SIZE'] = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+app.config['SQLITE_TEMP_STORE'] = os.environ.get('SQLITE_TEMP_STORE', 'MEMORY').upper()
+app.config['SQLITE_BUSY_TIMEOUT_MS'] = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+# Connections kept open per worker process, plus the burst allowed above that
+app.config['DB_POOL_SIZE'] = int(os.environ.get('DB_POOL_SIZE', 8))
+app.config['DB_MAX_OVERFLOW'] = int(os.environ.get('DB_MAX_OVERFLOW', 8))
+app.config['DB_POOL_TIMEOUT'] = int(os.environ.get('DB_POOL_TIMEOUT', 30))
+
+if app.config['SQLITE_TUNING'] and app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite:///'):
+    # A file database gets a real pool so threads reuse tuned connections instead
+    # of reopening the file on every checkout. check_same_thread is safe to turn
+    # off because the pool hands each connection to one thread at a time.
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'poolclass': QueuePool,
+        'pool_size': app.config['DB_POOL_SIZE'],
+        'max_overflow': app.config['DB_MAX_OVERFLOW'],
+        'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+        'connect_args': {
+            'timeout': app.config['SQLITE_BUSY_TIMEOUT_MS'] / 1000,
+            'check_same_thread': False,
+        },
+    }
+
 db = SQLAlchemy(app)
 
+# Allowed values for the pragmas that take keywords, since they are formatted
+# straight into the PRAGMA statement
+SQLITE_PRAGMA_CHOICES = {
+    'journal_mode': {'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'},
+    'synchronous': {'OFF', 'NORMAL', 'FULL', 'EXTRA'},
+    'temp_store': {'DEFAULT', 'FILE', 'MEMORY'},
+}
+
+# Apply the SQLite pragmas to each new DBAPI connection. WAL lets readers run
+# alongside the single writer, synchronous=NORMAL only fsyncs at checkpoints in
+# WAL mode, and busy_timeout makes a writer wait for the lock instead of
+# failing with "database is locked".
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not app.config['SQLITE_TUNING'] or not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    pragmas = {
+        'journal_mode': app.config['SQLITE_JOURNAL_MODE'],
+        'synchronous': app.config['SQLITE_SYNCHRONOUS'],
+        'temp_store': app.config['SQLITE_TEMP_STORE'],
+        'cache_size': int(app.config['SQLITE_CACHE_SIZE']),
+        'mmap_size': int(app.config['SQLITE_MMAP_SIZE']),
+        'busy_timeout': int(app.config['SQLITE_BUSY_TIMEOUT_MS']),
+    }
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            if name in SQLITE_PRAGMA_CHOICES and value not in SQLITE_PRAGMA_CHOICES[name]:
+                raise ValueError(f'Unsupported SQLite {name}: {value}')
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+# A forked worker must never use the SQLite connections its parent opened: two
+# processes sharing one file handle corrupt SQLite's locking. The child drops
+# the pool it inherited, without closing the connections under the parent, and
+# opens its own on first use.
+def discard_inherited_connections():
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+os.register_at_fork(after_in_child=discard_inherited_connections)
+
+# Per-request instrumentation. Cursor events count and time every statement a
+# request issues (including lazy loads fired while a template renders), the
+# template signals time rendering, and the request hooks fold each request into
+# per-endpoint totals served by /metrics.
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SLOWEST_STATEMENTS_KEPT = 5
+
+class RequestMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.recent = deque(maxlen=50)
+
+    def record(self, endpoint, method, status, profile):
+        with self.lock:
+            totals = self.endpoints.setdefault((endpoint, method), {
+                'requests': {}, 'duration': 0.0, 'statements': 0, 'db_time': 0.0, 'template_time': 0.0,
+                'buckets': [0] * len(REQUEST_DURATION_BUCKETS),
+            })
+            totals['requests'][status] = totals['requests'].get(status, 0) + 1
+            totals['duration'] += profile['duration']
+            totals['statements'] += profile['statements']
+            totals['db_time'] += profile['db_time']
+            totals['template_time'] += profile['template_time']
+            for i, bound in enumerate(REQUEST_DURATION_BUCKETS):
+                if profile['duration'] <= bound:
+                    totals['buckets'][i] += 1
+            self.recent.append(dict(endpoint=endpoint, method=method, status=status, **profile))
+
+    # Render the totals in the Prometheus text exposition format
+    def prometheus(self):
+        lines = [
+            '# HELP clubhub_requests_total Requests handled, by endpoint, method and status.',
+            '# TYPE clubhub_requests_total counter',
+        ]
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+            for (endpoint, method), totals in endpoints:
+                for status, count in sorted(totals['requests'].items()):
+                    lines.append(f'clubhub_requests_total{{endpoint="{endpoint}",method="{method}",status="{status}"}} {count}')
+
+            lines += [
+                '# HELP clubhub_request_duration_seconds Request latency.',
+                '# TYPE clubhub_request_duration_seconds histogram',
+            ]
+            for (endpoint, method), totals in endpoints:
+                labels = f'endpoint="{endpoint}",method="{method}"'
+                count = sum(totals['requests'].values())
+                for bound, bucket in zip(REQUEST_DURATION_BUCKETS, totals['buckets']):
+                    lines.append(f'clubhub_request_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket}')
+                lines.append(f'clubhub_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+                lines.append(f'clubhub_request_duration_seconds_sum{{{labels}}} {totals["duration"]:.6f}')
+                lines.append(f'clubhub_request_duration_seconds_count{{{labels}}} {count}')
+
+            for name, key, kind, help_text in (
+                ('clubhub_db_statements_total', 'statements', 'counter', 'SQL statements executed while handling requests.'),
+                ('clubhub_db_time_seconds_total', 'db_time', 'counter', 'Time spent executing SQL statements.'),
+                ('clubhub_template_render_seconds_total', 'template_time', 'counter', 'Time spent rendering templates.'),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+                for (endpoint, method), totals in endpoints:
+                    value = totals[key]
+                    value = f'{value:.6f}' if isinstance(value, float) else value
+                    lines.append(f'{name}{{endpoint="{endpoint}",method="{method}"}} {value}')
+        return lines
+
+request_metrics = RequestMetrics()
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('statement_started', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def stop_statement_timer(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['statement_started'].pop()
+    if not has_request_context() or 'profile' not in g:
+        return
+    profile = g.profile
+    profile['statements'] += 1
+    profile['db_time'] += elapsed
+    slowest = profile['slowest']
+    if len(slowest) < SLOWEST_STATEMENTS_KEPT or elapsed > slowest[-1][0]:
+        slowest.append((elapsed, ' '.join(statement.split())[:300]))
+        slowest.sort(key=lambda item: item[0], reverse=True)
+        del slowest[SLOWEST_STATEMENTS_KEPT:]
+
+# A failed statement never reaches after_cursor_execute, so drop its timer here
+@event.listens_for(Engine, 'handle_error')
+def discard_statement_timer(exception_context):
+    started = exception_context.connection.info.get('statement_started') if exception_context.connection else None
+    if started:
+        started.pop()
+
+@app.before_request
+def start_request_profile():
+    g.profile = {'started': time.perf_counter(), 'statements': 0, 'db_time': 0.0,
+                 'template_time': 0.0, 'slowest': []}
+
+def start_template_timer(sender, template, context, **extra):
+    if 'profile' in g:
+        g.profile['template_started'] = time.perf_counter()
+
+def stop_template_timer(sender, template, context, **extra):
+    if 'profile' in g and 'template_started' in g.profile:
+        g.profile['template_time'] += time.perf_counter() - g.profile.pop('template_started')
+
+before_render_template.connect(start_template_timer, app)
+template_rendered.connect(stop_template_timer, app)
+
+@app.after_request
+def finish_request_profile(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    profile['duration'] = time.perf_counter() - profile.pop('started')
+    profile.pop('template_started', None)
+    profile['slowest'] = [dict(seconds=round(seconds, 6), statement=statement) for seconds, statement in profile['slowest']]
+    endpoint = request.endpoint or 'unmatched'
+    request_metrics.record(endpoint, request.method, response.status_code, profile)
+
+    response.headers['Server-Timing'] = (
+        f"db;dur={profile['db_time'] * 1000:.2f}, tpl;dur={profile['template_time'] * 1000:.2f}, "
+        f"total;dur={profile['duration'] * 1000:.2f}"
+    )
+
+    over_queries = app.config['QUERY_BUDGET'] and profile['statements'] > app.config['QUERY_BUDGET']
+    over_latency = app.config['LATENCY_BUDGET_MS'] and profile['duration'] * 1000 > app.config['LATENCY_BUDGET_MS']
+    if over_queries or over_latency:
+        logger.warning('Request over budget method=%s path=%s endpoint=%s statements=%d duration_ms=%.2f '
+                       'db_ms=%.2f template_ms=%.2f slowest=%s', request.method, request.path, endpoint,
+                       profile['statements'], profile['duration'] * 1000, profile['db_time'] * 1000,
+                       profile['template_time'] * 1000, json.dumps(profile['slowest']))
+    return response
+
+
 # Enum for RSVP status
 class RSVPStatus(enum.Enum):
     yes = "yes"
@@ -55,8 +338,28 @@ class Meetings(db.Model):
     description = db.Column(db.String(500))
     club_id = db.Column(db.Integer, db.ForeignKey('club.id'))
     room_id = db.Column(db.Integer, db.ForeignKey('room.id'))
+    # Start and end of the booking, derived from date, time and duration on every
+    # write so room overlaps can be answered from the index below
+    start_at = db.Column(db.DateTime)
+    end_at = db.Column(db.DateTime)
     club = db.relationship('Club', backref=db.backref('meetings', lazy=True))
     room = db.relationship('Room', backref=db.backref('meetings', lazy=True))
+    __table_args__ = (
+        db.Index('idx_meetings_room_start', 'room_id', 'start_at', 'end_at'),
+        db.Index('idx_meetings_start', 'start_at', 'end_at', 'room_id'),
+    )
+
+# Start and end datetimes of a meeting, or (None, None) if it has no time yet
+def meeting_interval(date, time, duration):
+    if date is None or time is None:
+        return None, None
+    start_at = datetime.combine(date, time)
+    return start_at, start_at + timedelta(minutes=int(duration or 0))
+
+@event.listens_for(Meetings, 'before_insert')
+@event.listens_for(Meetings, 'before_update')
+def set_meeting_interval(mapper, connection, target):
+    target.start_at, target.end_at = meeting_interval(target.date, target.time, target.duration)
 
 class MeetingOrganizers(db.Model):
     meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), primary_key=True)
@@ -73,8 +376,637 @@ class RSVPs(db.Model):
     meeting = db.relationship('Meetings', backref=db.backref('rsvps', lazy=True))
     student = db.relationship('Student', backref=db.backref('rsvps', lazy=True))
 
+# Per-meeting RSVP counts, kept current by the RSVP and meeting write paths so
+# reports never have to aggregate the raw RSVPs rows
+class MeetingRSVPCounts(db.Model):
+    meeting_id = db.Column(db.Integer, db.ForeignKey('meetings.id'), primary_key=True)
+    invited_count = db.Column(db.Integer, nullable=False, default=0)
+    yes_count = db.Column(db.Integer, nullable=False, default=0)
+    no_count = db.Column(db.Integer, nullable=False, default=0)
+    maybe_count = db.Column(db.Integer, nullable=False, default=0)
+
+# Per-day meeting and RSVP totals, refreshed for the days a transaction touches
+# so analytics over long ranges read rollup rows instead of meetings and RSVPs.
+# Each day has one 'all' row plus one row per club ('club' scope) and per room
+# ('room' scope), with the club or room id in scope_id.
+class MeetingDailyStats(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    day = db.Column(db.Date, nullable=False)
+    scope = db.Column(db.String(10), nullable=False)
+    scope_id = db.Column(db.Integer)
+    meeting_count = db.Column(db.Integer, nullable=False, default=0)
+    total_minutes = db.Column(db.Integer, nullable=False, default=0)
+    invited_count = db.Column(db.Integer, nullable=False, default=0)
+    yes_count = db.Column(db.Integer, nullable=False, default=0)
+    no_count = db.Column(db.Integer, nullable=False, default=0)
+    maybe_count = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.Index('idx_daily_stats_scope_day', 'scope', 'day', 'scope_id'),
+    )
+
+# Responses to JSON write requests sent with an Idempotency-Key header, stored in
+# the same transaction as the writes and replayed when a client retries
+class IdempotencyKeys(db.Model):
+    key = db.Column(db.String(200), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False, index=True)
+
+# Single-row counter bumped by every commit that invalidates cached reports, so
+# a worker process can tell with one primary-key read whether any process has
+# written since its report cache last looked
+class ReportCacheGeneration(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    generation = db.Column(db.Integer, nullable=False, default=0)
+
+# Durable outbox of notifications, written in the same transaction as the RSVPs
+# they announce and drained by NotificationWorker. A pending row is due once
+# next_attempt_at passes. Claiming a row stamps it with the worker's claim_token
+# and pushes next_attempt_at out by the lease, so no other worker takes it while
+# it is being sent. Rows end as 'sent' or, after the last failed attempt, 'dead'.
+class NotificationOutbox(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)
+    meeting_id = db.Column(db.Integer)
+    student_id = db.Column(db.Integer)
+    status = db.Column(db.String(10), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False)
+    claim_token = db.Column(db.String(32))
+    last_error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, nullable=False)
+    sent_at = db.Column(db.DateTime)
+    __table_args__ = (
+        db.Index('idx_outbox_status_due', 'status', 'next_attempt_at'),
+        db.Index('idx_outbox_claim', 'claim_token'),
+    )
+
+
+# In-process cache for small reference tables (clubs and rooms). Each table has a
+# version that is bumped whenever a commit touches one of its rows, and a cached
+# list is served only while its version is current and it is younger than the
+# TTL. The TTL bounds staleness for writes made by other processes, which this
+# process cannot see. Rows are cached as plain result tuples, never as ORM
+# instances, so they are safe to share between sessions and threads.
+class ReferenceCache:
+    def __init__(self, loaders, ttl):
+        self.loaders = loaders
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.versions = {name: 0 for name in loaders}
+        self.entries = {}
+        self.hits = {name: 0 for name in loaders}
+        self.misses = {name: 0 for name in loaders}
+
+    def get(self, name):
+        with self.lock:
+            version = self.versions[name]
+            entry = self.entries.get(name)
+            if entry and entry[0] == version and time.monotonic() - entry[1] < self.ttl:
+                self.hits[name] += 1
+                return entry[2]
+            self.misses[name] += 1
+
+        rows = self.loaders[name]()
+        with self.lock:
+            # Only store the load if no write committed while it was running
+            if self.versions[name] == version:
+                self.entries[name] = (version, time.monotonic(), rows)
+        return rows
+
+    def invalidate(self, *names):
+        with self.lock:
+            for name in names:
+                self.versions[name] += 1
+                self.entries.pop(name, None)
+
+    def stats(self):
+        with self.lock:
+            return {
+                name: dict(hits=self.hits[name], misses=self.misses[name], version=self.versions[name])
+                for name in self.loaders
+            }
+
+
+def load_clubs():
+    return db.session.query(Club.id, Club.name, Club.address, Club.description).order_by(Club.id).all()
+
+def load_rooms():
+    return db.session.query(Room.id, Room.building, Room.number, Room.max_capacity).order_by(Room.id).all()
+
+reference_cache = ReferenceCache({'clubs': load_clubs, 'rooms': load_rooms}, app.config['REFERENCE_CACHE_TTL'])
+
+# Cache entry invalidated by writes to each mapped class
+REFERENCE_CACHE_TABLES = {Club: 'clubs', Room: 'rooms'}
+
+# Remember which reference tables a flush wrote to; the cache is only
+# invalidated once the transaction commits
+@event.listens_for(Session, 'after_flush')
+def track_reference_writes(session, flush_context):
+    touched = session.info.setdefault('reference_cache_touched', set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = REFERENCE_CACHE_TABLES.get(type(obj))
+        if name:
+            touched.add(name)
+
+# Bulk Query.update()/delete() calls bypass the flush, so catch them here
+@event.listens_for(Session, 'do_orm_execute')
+def track_reference_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        name = REFERENCE_CACHE_TABLES.get(mapper.class_) if mapper is not None else None
+        if name:
+            orm_execute_state.session.info.setdefault('reference_cache_touched', set()).add(name)
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_reference_cache(session):
+    touched = session.info.pop('reference_cache_touched', None)
+    if touched:
+        reference_cache.invalidate(*touched)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_reference_writes(session):
+    session.info.pop('reference_cache_touched', None)
+
+
+# Bounded LRU cache of generated reports keyed on the normalized filter
+# (start_date, end_date, club_id, room_id), where a None club/room means "all".
+# Each entry remembers the meeting ids it contains, so an RSVP change only drops
+# the reports listing that meeting, and a meeting write only drops the reports
+# whose filter covers the meeting's old or new (date, club, room). Those hooks
+# only see this process's writes, so every lookup also passes the shared
+# ReportCacheGeneration value: if it moved for any reason other than this
+# process's own commits, another worker wrote and the whole cache is dropped.
+# Entries expire after the TTL, which bounds staleness for writes made outside
+# the session hooks.
+class ReportCache:
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.generation = 0
+        self.db_generation = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key, db_generation):
+        with self.lock:
+            if db_generation != self.db_generation:
+                self.clear(db_generation)
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[2] >= self.ttl:
+                del self.entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, self.generation
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], self.generation
+
+    # Store a report computed when the cache was at `generation`. If anything was
+    # invalidated since, the report may already be stale and is dropped.
+    def put(self, key, payload, meeting_ids, generation):
+        with self.lock:
+            if generation != self.generation:
+                return
+            self.entries[key] = (frozenset(meeting_ids), payload, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    # Drop the reports a commit of this process made stale. The commit moved the
+    # shared generation to db_generation; if that skips past the last one seen,
+    # another process committed in between and nothing cached can be trusted.
+    def invalidate(self, meeting_ids=(), slots=(), everything=False, db_generation=None):
+        with self.lock:
+            if db_generation is not None:
+                # A lookup already saw this commit and dropped everything
+                if self.db_generation is not None and db_generation <= self.db_generation:
+                    return
+                if db_generation != (self.db_generation or 0) + 1:
+                    self.clear(db_generation)
+                    return
+                self.db_generation = db_generation
+            self.generation += 1
+            stale = [
+                key for key, (ids, _, _) in self.entries.items()
+                if everything or not ids.isdisjoint(meeting_ids)
+                or any(report_key_covers(key, slot) for slot in slots)
+            ]
+            for key in stale:
+                del self.entries[key]
+            self.invalidations += len(stale)
+
+    # Drop every entry and adopt db_generation; called with the lock held
+    def clear(self, db_generation):
+        self.generation += 1
+        self.db_generation = db_generation
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return dict(hits=self.hits, misses=self.misses, size=len(self.entries),
+                        invalidations=self.invalidations,
+                        hit_ratio=round(self.hits / lookups, 4) if lookups else None)
+
+# Does the report filter `key` include a meeting at slot (date, club_id, room_id)?
+def report_key_covers(key, slot):
+    start_date, end_date, club_id, room_id = key
+    date, slot_club_id, slot_room_id = slot
+    return (date is None or start_date <= date <= end_date) \
+        and (club_id is None or slot_club_id is None or club_id == slot_club_id) \
+        and (room_id is None or slot_room_id is None or room_id == slot_room_id)
+
+# Form values arrive as strings; compare slots on ints so '1' and 1 match
+def as_int(value):
+    return int(value) if value not in (None, '') else None
+
+report_cache = ReportCache(app.config['REPORT_CACHE_SIZE'], app.config['REPORT_CACHE_TTL'])
+
+def report_cache_pending(session):
+    return session.info.setdefault('report_cache_pending', {'meeting_ids': set(), 'slots': set(), 'everything': False,
+                                                           'rsvp_deltas': {}})
+
+# Record the old and new slot of every meeting written in a flush
+@event.listens_for(Session, 'after_flush')
+def track_report_writes(session, flush_context):
+    pending = None
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, Meetings):
+            continue
+        pending = pending or report_cache_pending(session)
+        state = inspect(obj)
+        pending['meeting_ids'].add(as_int(obj.id))
+        pending['slots'].add((obj.date, as_int(obj.club_id), as_int(obj.room_id)))
+        # Slot the meeting held before this flush, if it was moved
+        old = [state.attrs[name].history.deleted for name in ('date', 'club_id', 'room_id')]
+        if any(old):
+            pending['slots'].add((
+                old[0][0] if old[0] else obj.date,
+                as_int(old[1][0]) if old[1] else as_int(obj.club_id),
+                as_int(old[2][0]) if old[2] else as_int(obj.room_id),
+            ))
+
+# Bulk Query.update()/delete() on meetings cannot say which rows they hit
+@event.listens_for(Session, 'do_orm_execute')
+def track_report_bulk_writes(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is Meetings:
+            report_cache_pending(orm_execute_state.session)['everything'] = True
+
+@event.listens_for(Session, 'after_commit')
+def invalidate_report_cache(session):
+    pending = session.info.pop('report_cache_pending', None)
+    if pending:
+        report_cache.invalidate(pending['meeting_ids'], pending['slots'], pending['everything'],
+                                pending.get('db_generation'))
+
+# Advance the shared report cache generation inside the caller's transaction and
+# return the new value
+def bump_report_cache_generation(session):
+    stmt = sqlite_insert(ReportCacheGeneration).values(id=1, generation=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ReportCacheGeneration.id],
+        set_={'generation': ReportCacheGeneration.generation + 1}
+    )
+    session.execute(stmt)
+    return report_cache_db_generation(session)
+
+def report_cache_db_generation(session):
+    return session.execute(
+        select(ReportCacheGeneration.generation).where(ReportCacheGeneration.id == 1)
+    ).scalar() or 0
+
+@event.listens_for(Session, 'after_rollback')
+def discard_report_writes(session):
+    session.info.pop('report_cache_pending', None)
+
+
+# Column in MeetingRSVPCounts holding the tally for each RSVP status. Legacy
+# rows with a NULL status count as invited but in none of the status columns.
+ROLLUP_STATUS_COLUMNS = {
+    RSVPStatus.yes: 'yes_count',
+    RSVPStatus.no: 'no_count',
+    RSVPStatus.maybe: 'maybe_count',
+    None: None,
+}
+
+# Tallies kept per meeting in MeetingRSVPCounts and per day in MeetingDailyStats
+ROLLUP_COUNT_COLUMNS = ('invited_count', 'yes_count', 'no_count', 'maybe_count')
+
+# Stands for "no RSVP row" in adjust_rsvp_rollup, where None is a NULL status
+NO_RSVP = object()
+
+# Changes to the rollup tallies for one RSVP change, `count` times over.
+# old_status is NO_RSVP for a new invitation, new_status is NO_RSVP for a
+# deletion.
+def rsvp_rollup_deltas(old_status=NO_RSVP, new_status=NO_RSVP, count=1):
+    deltas = dict.fromkeys(ROLLUP_COUNT_COLUMNS, 0)
+    if old_status is NO_RSVP:
+        deltas['invited_count'] += count
+    elif ROLLUP_STATUS_COLUMNS[old_status]:
+        deltas[ROLLUP_STATUS_COLUMNS[old_status]] -= count
+    if new_status is NO_RSVP:
+        deltas['invited_count'] -= count
+    elif ROLLUP_STATUS_COLUMNS[new_status]:
+        deltas[ROLLUP_STATUS_COLUMNS[new_status]] += count
+    return deltas
+
+# Add {meeting_id: {column: delta}} to the rollup inside the caller's
+# transaction, as one executemany upsert whatever the number of meetings
+def apply_rsvp_rollup_deltas(meeting_deltas):
+    rows = [dict(meeting_id=meeting_id, **deltas) for meeting_id, deltas in meeting_deltas.items()
+            if any(deltas.values())]
+    if not rows:
+        return
+    stmt = sqlite_insert(MeetingRSVPCounts)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MeetingRSVPCounts.meeting_id],
+        set_={name: getattr(MeetingRSVPCounts, name) + stmt.excluded[name] for name in ROLLUP_COUNT_COLUMNS}
+    )
+    db.session.execute(stmt, rows)
+    # Cached reports listing these meetings now carry stale counts, and the
+    # daily rollup is moved by the same deltas when the transaction commits
+    pending = report_cache_pending(db.session)
+    for row in rows:
+        meeting_id = as_int(row['meeting_id'])
+        pending['meeting_ids'].add(meeting_id)
+        totals = pending['rsvp_deltas'].setdefault(meeting_id, dict.fromkeys(ROLLUP_COUNT_COLUMNS, 0))
+        for name in ROLLUP_COUNT_COLUMNS:
+            totals[name] += row[name]
+
+# Apply one RSVP change to the rollup inside the caller's transaction, `count`
+# times over; see rsvp_rollup_deltas for the statuses
+def adjust_rsvp_rollup(meeting_id, old_status=NO_RSVP, new_status=NO_RSVP, count=1):
+    apply_rsvp_rollup_deltas({meeting_id: rsvp_rollup_deltas(old_status, new_status, count)})
+
+# Recompute the rollup straight from RSVPs and return the meetings whose stored
+# counts had drifted, as (meeting_id, stored, actual) tuples. With fix=False the
+# rollup is only verified and left untouched. Rows with a NULL status are
+# counted as invited only, matching adjust_rsvp_rollup.
+def rebuild_rsvp_rollup(fix=True):
+    actual = {
+        row.meeting_id: (row.invited_count, row.yes_count, row.no_count, row.maybe_count)
+        for row in db.session.query(
+            RSVPs.meeting_id,
+            func.count(RSVPs.student_id).label('invited_count'),
+            func.sum(case((RSVPs.status == RSVPStatus.yes.name, 1), else_=0)).label('yes_count'),
+            func.sum(case((RSVPs.status == RSVPStatus.no.name, 1), else_=0)).label('no_count'),
+            func.sum(case((RSVPs.status == RSVPStatus.maybe.name, 1), else_=0)).label('maybe_count')
+        ).filter(RSVPs.meeting_id.isnot(None)).group_by(RSVPs.meeting_id)
+    }
+    stored = {
+        row.meeting_id: (row.invited_count, row.yes_count, row.no_count, row.maybe_count)
+        for row in MeetingRSVPCounts.query
+    }
+
+    # A missing rollup row is equivalent to a row of zeros
+    zeros = (0, 0, 0, 0)
+    drift = [
+        (meeting_id, stored.get(meeting_id, zeros), actual.get(meeting_id, zeros))
+        for meeting_id in sorted(set(actual) | set(stored))
+        if stored.get(meeting_id, zeros) != actual.get(meeting_id, zeros)
+    ]
+
+    if fix:
+        report_cache_pending(db.session)['everything'] = True
+        MeetingRSVPCounts.query.delete()
+        db.session.bulk_insert_mappings(MeetingRSVPCounts, [
+            dict(meeting_id=meeting_id, invited_count=counts[0], yes_count=counts[1],
+                 no_count=counts[2], maybe_count=counts[3])
+            for meeting_id, counts in actual.items()
+        ])
+        db.session.commit()
+    return drift
+
+# Meeting column behind each daily rollup scope
+DAILY_STATS_SCOPES = {'all': None, 'club': Meetings.club_id, 'room': Meetings.room_id}
+
+# Recompute the daily rollup rows for `days`, or for every day when days is
+# None, from meetings and the per-meeting RSVP counts
+def refresh_daily_stats(session, days=None):
+    table = MeetingDailyStats.__table__
+    columns = ['day', 'scope', 'scope_id', 'meeting_count', 'total_minutes',
+               'invited_count', 'yes_count', 'no_count', 'maybe_count']
+
+    if days is None:
+        session.execute(table.delete())
+        for source in daily_stats_sources(Meetings.date.isnot(None)).values():
+            session.execute(table.insert().from_select(columns, source))
+        return
+    days = sorted(days)
+    for i in range(0, len(days), BULK_INSERT_BATCH_SIZE):
+        batch = days[i:i + BULK_INSERT_BATCH_SIZE]
+        session.execute(table.delete().where(table.c.day.in_(batch)))
+        for source in daily_stats_sources(Meetings.date.in_(batch)).values():
+            session.execute(table.insert().from_select(columns, source))
+
+# The SELECT computing each scope's rollup rows for the meetings matching
+# day_filter, keyed by scope
+def daily_stats_sources(day_filter):
+    sources = {}
+    for scope, column in DAILY_STATS_SCOPES.items():
+        keys = [Meetings.date] + ([column] if column is not None else [])
+        sources[scope] = select(
+            Meetings.date, literal(scope),
+            column if column is not None else literal(None, db.Integer),
+            func.count(Meetings.id),
+            func.coalesce(func.sum(Meetings.duration), 0),
+            func.coalesce(func.sum(MeetingRSVPCounts.invited_count), 0),
+            func.coalesce(func.sum(MeetingRSVPCounts.yes_count), 0),
+            func.coalesce(func.sum(MeetingRSVPCounts.no_count), 0),
+            func.coalesce(func.sum(MeetingRSVPCounts.maybe_count), 0)
+        ).select_from(Meetings).outerjoin(
+            MeetingRSVPCounts, MeetingRSVPCounts.meeting_id == Meetings.id
+        ).where(day_filter).group_by(*keys)
+    return sources
+
+# Add per-meeting RSVP count deltas to the daily rollup rows of each meeting's
+# day, club and room with one executemany UPDATE, skipping the meetings on
+# `skip_days`, which are recomputed instead. A day with no rollup rows yet is
+# recomputed whole.
+def apply_daily_stats_deltas(session, meeting_deltas, skip_days=()):
+    meeting_ids = sorted(meeting_id for meeting_id in meeting_deltas if meeting_id is not None)
+    changes = {}
+    for i in range(0, len(meeting_ids), BULK_INSERT_BATCH_SIZE):
+        batch = meeting_ids[i:i + BULK_INSERT_BATCH_SIZE]
+        for row in session.query(Meetings.id, Meetings.date, Meetings.club_id, Meetings.room_id).filter(
+                Meetings.id.in_(batch)):
+            if row.date is None or row.date in skip_days:
+                continue
+            for scope, scope_id in (('all', None), ('club', row.club_id), ('room', row.room_id)):
+                totals = changes.setdefault((row.date, scope, scope_id), dict.fromkeys(ROLLUP_COUNT_COLUMNS, 0))
+                for name, delta in meeting_deltas[row.id].items():
+                    totals[name] += delta
+
+    rows = [
+        dict(b_day=day, b_scope=scope, b_scope_id=scope_id, **{'d_' + name: delta for name, delta in totals.items()})
+        for (day, scope, scope_id), totals in changes.items() if any(totals.values())
+    ]
+    if not rows:
+        return
+    table = MeetingDailyStats.__table__
+    stmt = table.update().where(
+        table.c.scope == bindparam('b_scope'), table.c.day == bindparam('b_day'),
+        table.c.scope_id.is_(bindparam('b_scope_id'))
+    ).values({name: table.c[name] + bindparam('d_' + name) for name in ROLLUP_COUNT_COLUMNS})
+    if session.execute(stmt, rows).rowcount < len(rows):
+        refresh_daily_stats(session, {row['b_day'] for row in rows})
+
+# Before a transaction commits, bring the daily rollup up to date. The report
+# cache bookkeeping already records every meeting slot written, whose days are
+# recomputed, and the RSVP count deltas of every other meeting, which are added
+# to the existing rows so an RSVP write costs the same however busy its day is.
+@event.listens_for(Session, 'before_commit')
+def refresh_touched_daily_stats(session):
+    session.flush()
+    pending = session.info.get('report_cache_pending')
+    if not pending or pending.get('daily_stats_refreshed'):
+        return
+    pending['daily_stats_refreshed'] = True
+    if pending['everything']:
+        refresh_daily_stats(session)
+        return
+
+    days = {slot[0] for slot in pending['slots'] if slot[0] is not None}
+    if days:
+        refresh_daily_stats(session, days)
+    if pending['rsvp_deltas']:
+        apply_daily_stats_deltas(session, pending['rsvp_deltas'], days)
+
+# Registered after the daily rollup refresh so it runs last: a transaction that
+# changes what reports show also bumps the shared generation, telling the other
+# worker processes to drop their cached reports. Migrations skip this, since
+# the table may not exist yet, and bump it once when they are done.
+@event.listens_for(Session, 'before_commit')
+def bump_touched_report_generation(session):
+    pending = session.info.get('report_cache_pending')
+    if not pending or 'db_generation' in pending or session.info.get('migrating'):
+        return
+    pending['db_generation'] = bump_report_cache_generation(session)
+
+
+# Indexes backing the /search typeahead endpoints, the free-room finder and the
+# daily rollup refresh. NOCASE collation lets SQLite answer the case-insensitive
+# LIKE 'prefix%' lookups with an index range scan.
+SEARCH_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_student_name_nocase ON student(name COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_student_email_nocase ON student(email COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_meetings_description_nocase ON meetings(description COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_meetings_club_date ON meetings(club_id, date);",
+    "CREATE INDEX IF NOT EXISTS idx_club_name_nocase ON club(name COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_room_building_nocase ON room(building COLLATE NOCASE);",
+    "CREATE INDEX IF NOT EXISTS idx_room_number_nocase ON room(number COLLATE NOCASE);",
+    # Lets the free-room finder walk rooms in tightest-fit order
+    "CREATE INDEX IF NOT EXISTS idx_room_capacity ON room(max_capacity);",
+    # Lets the daily rollup refresh read only the meetings on the touched days
+    "CREATE INDEX IF NOT EXISTS idx_meetings_date_club_room ON meetings(date, club_id, room_id);",
+]
+
+# Schema migrations, applied in order to bring any database up to date. The
+# applied version lives in SQLite's PRAGMA user_version. The driver runs DDL
+# outside a transaction, so every migration must be safe to re-run, and the
+# version is only bumped once a migration has completed. A migration that adds a
+# table creates it with Model.__table__.create(db.engine, checkfirst=True).
+def create_missing_tables():
+    db.create_all()
+
+# Add the start_at/end_at booking columns and their index to a meetings table
+# created before they existed, and fill them in for the existing rows
+def ensure_meeting_intervals():
+    columns = {row[1] for row in db.session.execute(text("PRAGMA table_info(meetings)"))}
+    for column in ('start_at', 'end_at'):
+        if column not in columns:
+            db.session.execute(text(f"ALTER TABLE meetings ADD COLUMN {column} DATETIME"))
+    db.session.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_meetings_room_start ON meetings(room_id, start_at, end_at);"
+    ))
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS idx_meetings_start ON meetings(start_at, end_at, room_id);"))
+
+    missing = db.session.query(Meetings.id, Meetings.date, Meetings.time, Meetings.duration).filter(
+        Meetings.start_at.is_(None)
+    ).all()
+    db.session.bulk_update_mappings(Meetings, [
+        dict(zip(('id', 'start_at', 'end_at'), (row.id, *meeting_interval(row.date, row.time, row.duration))))
+        for row in missing
+    ])
+    db.session.commit()
+
+def create_search_indexes():
+    for ddl in SEARCH_INDEXES:
+        db.session.execute(text(ddl))
+
+def backfill_rollups():
+    if RSVPs.query.first():
+        rebuild_rsvp_rollup()
+    refresh_daily_stats(db.session)
+
+# Index the lookups the RSVP and organizer pages make by student. The
+# (meeting_id, student_id) index duplicates the primary key of rsv_ps, so it is
+# dropped, except on databases whose rsv_ps still has the old surrogate rsvp_id
+# key, where it is the only index for (meeting, student) lookups.
+def add_lookup_indexes():
+    primary_key = [row[1] for row in sorted(
+        (row for row in db.session.execute(text("PRAGMA table_info(rsv_ps)")) if row[5]), key=lambda row: row[5]
+    )]
+    if primary_key == ['meeting_id', 'student_id']:
+        db.session.execute(text("DROP INDEX IF EXISTS idx_rsvps_meeting_student;"))
+    else:
+        db.session.execute(text("CREATE INDEX IF NOT EXISTS idx_rsvps_meeting_student ON rsv_ps(meeting_id, student_id);"))
+    db.session.execute(text("CREATE INDEX IF NOT EXISTS idx_rsvps_student_status ON rsv_ps(student_id, status);"))
+    db.session.execute(text(
+        "CREATE INDEX IF NOT EXISTS idx_meeting_organizers_student ON meeting_organizers(student_id, meeting_id);"
+    ))
+
+def create_report_cache_generation():
+    ReportCacheGeneration.__table__.create(db.engine, checkfirst=True)
+
+SCHEMA_MIGRATIONS = [
+    (1, 'Create missing tables', create_missing_tables),
+    (2, 'Add meeting booking intervals', ensure_meeting_intervals),
+    (3, 'Add search and report indexes', create_search_indexes),
+    (4, 'Backfill the RSVP and daily rollups', backfill_rollups),
+    (5, 'Add RSVP and organizer lookup indexes', add_lookup_indexes),
+    (6, 'Add the shared report cache generation', create_report_cache_generation),
+]
+
+def schema_version():
+    return db.session.execute(text("PRAGMA user_version")).scalar()
+
+# Apply every migration newer than the database's version; returns the
+# versions applied
+def migrate_database():
+    applied = []
+    db.session.info['migrating'] = True
+    try:
+        for version, name, migration in SCHEMA_MIGRATIONS:
+            if version <= schema_version():
+                continue
+            started = time.perf_counter()
+            migration()
+            db.session.commit()
+            db.session.execute(text(f"PRAGMA user_version = {int(version)}"))
+            db.session.commit()
+            applied.append(version)
+            logger.info('Applied migration %d (%s) in %.2fs', version, name, time.perf_counter() - started)
+    finally:
+        db.session.info.pop('migrating', None)
+    # Running workers drop the reports cached before the migration
+    if applied:
+        bump_report_cache_generation(db.session)
+        db.session.commit()
+    return applied
 
 def initialize_database():
+    migrate_database()
+
     # Check if the database already has entries to prevent re-initialization
     if not Student.query.first():
         # No students found, assuming database is empty and needs initialization
@@ -104,12 +1036,143 @@ def initialize_database():
         db.session.add_all(club_list + room_list + student_list)
         db.session.commit()
 
-        db.engine.execute(DDL("CREATE INDEX IF NOT EXISTS idx_meetings_date_club_room ON Meetings(date, club_id, room_id);"))
-        db.engine.execute(DDL("CREATE INDEX IF NOT EXISTS idx_rsvps_meeting_student ON RSVPs(meeting_id, student_id);"))
+        logger.info('Database initialized with clubs, rooms, and students.')
+    else:
+        logger.info('Database already initialized. Skipping.')
+
+# Load what a fresh process would otherwise fetch on its first requests: the
+# club and room lists and the compiled templates. A server that runs this
+# before forking hands every worker warm caches.
+def warm_up():
+    started = time.perf_counter()
+    for name in reference_cache.loaders:
+        reference_cache.get(name)
+    for name in app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        app.jinja_env.get_template(name)
+    logger.info('Caches warmed in %.3fs', time.perf_counter() - started)
 
-        print("Database initialized with clubs, rooms, and students.")
+
+# Command line entry point to apply pending schema migrations:
+#   flask --app app migrate [--status]
+@app.cli.command('migrate')
+@click.option('--status', is_flag=True, help='List the migrations and which are applied, without applying any.')
+def migrate_command(status):
+    if status:
+        current = schema_version()
+        for version, name, _ in SCHEMA_MIGRATIONS:
+            click.echo(f"{version:3} {'applied' if version <= current else 'pending':8} {name}")
+        return
+    applied = migrate_database()
+    click.echo(f'Schema at version {schema_version()}, {len(applied)} migration(s) applied.')
+
+
+# Queries on the request and worker hot paths, built by the same functions the
+# routes use, with the tables each one may legitimately walk in index order
+# (the free-room finder reads rooms in capacity order and stops at its limit,
+# and the RSVP response lookup walks its own list of pairs)
+def hot_path_queries():
+    day = datetime(2024, 1, 8).date()
+    start_at = datetime(2024, 1, 8, 18, 0)
+    end_at = start_at + timedelta(minutes=60)
+    now = datetime.utcnow()
+    return [
+        ('report for a date range', report_query(day, day + timedelta(days=30)), ()),
+        ('report for a club', report_query(day, day + timedelta(days=30), club_id=1), ()),
+        ('report for a room', report_query(day, day + timedelta(days=30), room_id=1), ()),
+        ('room overlap check', db.session.query(Meetings.id).filter(room_busy_clause(1, start_at, end_at)), ()),
+        ('free room finder', free_rooms_query(start_at, end_at, 10).limit(10), ('room',)),
+        ('RSVP by meeting and student', RSVPs.query.filter_by(meeting_id=1, student_id=1), ()),
+        ('RSVP response pairs', rsvp_pairs_query([(1, 1), (2, 2)]), ('pairs',)),
+        ('RSVPs for a meeting', rsvp_page_query(meeting_id=1).limit(51), ()),
+        ('RSVPs for a student by status', rsvp_page_query(student_id=1, status=RSVPStatus.yes).limit(51), ()),
+        ('organizers for a student', organizers_query(student_id=1), ()),
+        ('student name search', student_search_query('jo').limit(SEARCH_LIMIT), ()),
+        ('analytics for all clubs', analytics_query(day, day + timedelta(days=365), 'week'), ()),
+        ('analytics for a club', analytics_query(day, day + timedelta(days=365), 'month', 'club', 1), ()),
+        ('analytics by room', analytics_query(day, day + timedelta(days=365), 'day', 'room', None, 'room'), ()),
+    ] + [
+        (f'daily rollup refresh ({scope})', source, ())
+        for scope, source in daily_stats_sources(Meetings.date.in_([day, day + timedelta(days=7)])).items()
+    ] + [
+        ('notification claim', due_notifications_query(now, 50), ()),
+        ('idempotency key lookup', idempotent_response_query('key', now), ()),
+    ]
+
+# Run EXPLAIN QUERY PLAN for every hot-path query and return
+# (name, plan lines, full scans), where a full scan is any plan step that walks
+# a whole table, by rowid or by index, other than the allowed ones; walking the
+# literal rows of a VALUES list is not one
+def check_query_plans():
+    # Rewrite the statements to EXPLAIN QUERY PLAN on their way to the driver, so
+    # each query is planned with its real SQL and bound parameters
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        return 'EXPLAIN QUERY PLAN ' + statement, parameters
+
+    results = []
+    connection = db.session.connection()
+    # EXPLAIN does not open a read transaction, so a pooled connection that
+    # predates a migration would plan against the schema it last loaded; a real
+    # read makes SQLite notice the change and reload it. The driver caches the
+    # prepared EXPLAIN statements, which never recheck the schema, so the
+    # connection is discarded afterwards instead of going back to the pool.
+    connection.execute(text('SELECT count(*) FROM sqlite_master'))
+    event.listen(connection, 'before_cursor_execute', explain, retval=True)
+    try:
+        for name, query, allowed in hot_path_queries():
+            plan = [row[3] for row in connection.execute(getattr(query, 'statement', query))]
+            scans = [
+                line for line in plan
+                if line.startswith('SCAN ') and line.split()[1] not in allowed
+                and not line.split()[1].startswith('(') and line.split()[1] != 'CONSTANT'
+                and not line.endswith(' CONSTANT ROWS')
+            ]
+            results.append((name, plan, scans))
+    finally:
+        event.remove(connection, 'before_cursor_execute', explain)
+        connection.invalidate()
+        db.session.rollback()
+    return results
+
+# Command line entry point failing when a hot-path query plans a full scan:
+#   flask --app app check-query-plans [--verbose]
+@app.cli.command('check-query-plans')
+@click.option('--verbose', is_flag=True, help='Print every plan, not only the failing ones.')
+def check_query_plans_command(verbose):
+    failures = 0
+    for name, plan, scans in check_query_plans():
+        if scans:
+            failures += 1
+        if scans or verbose:
+            click.echo(f"{'FULL SCAN' if scans else 'ok':9} {name}")
+            for line in plan:
+                click.echo(f'            {line}')
+    click.echo(f'{failures} hot-path quer{"y" if failures == 1 else "ies"} with a full table scan.')
+    if failures:
+        raise SystemExit(1)
+
+
+# Command line entry point to verify or rebuild the RSVP rollup:
+#   flask --app app rsvp-rollup [--verify-only]
+@app.cli.command('rsvp-rollup')
+@click.option('--verify-only', is_flag=True, help='Report drift without rewriting the rollup.')
+def rsvp_rollup_command(verify_only):
+    drift = rebuild_rsvp_rollup(fix=not verify_only)
+    for meeting_id, stored, actual in drift:
+        click.echo(f'Meeting {meeting_id}: stored (invited, yes, no, maybe)={stored} actual={actual}')
+    if verify_only:
+        click.echo(f'{len(drift)} meeting(s) out of date.')
+        if drift:
+            raise SystemExit(1)
     else:
-        print("Database already initialized. Skipping.")
+        click.echo(f'Rollup rebuilt, {len(drift)} meeting(s) corrected.')
+
+# Command line entry point to rebuild the daily analytics rollup from scratch:
+#   flask --app app daily-stats
+@app.cli.command('daily-stats')
+def daily_stats_command():
+    refresh_daily_stats(db.session)
+    db.session.commit()
+    click.echo(f'Daily rollup rebuilt, {MeetingDailyStats.query.count()} row(s).')
 
 
 # Define routes for the application
@@ -123,7 +1186,7 @@ def home():
 def add_edit_delete():
     if request.method == 'POST':
         action = request.form.get('action')
-        print(action)
+        logger.debug('add_edit_delete action=%s', action)
         
         if action == "delete":
             # Handle delete action
@@ -132,18 +1195,19 @@ def add_edit_delete():
             if meeting:
 
                 try:
+                    MeetingRSVPCounts.query.filter_by(meeting_id=meeting.id).delete()
                     db.session.delete(meeting)
                     db.session.commit()
                     flash('Meeting deleted successfully!', 'success')
-                    print('Meeting deleted successfully!')
+                    logger.info('Meeting deleted meeting_id=%s', meeting_id)
                 except Exception as e:
                     db.session.rollback()
                     flash('Failed to deleted. Error: ' + str(e), 'error')
-                    print('Failed to deleted. Error: ' + str(e))
+                    logger.error('Meeting delete failed meeting_id=%s error=%s', meeting_id, e)
                 
             else:
                 flash('Meeting not found.', 'error')
-                print('Meeting not found1.')
+                logger.warning('Meeting not found meeting_id=%s', meeting_id)
         else:
             meeting_id = request.form.get('meetingID')
 
@@ -156,12 +1220,20 @@ def add_edit_delete():
             description = request.form.get('description')
             club_id = request.form.get('club_id')
             room_id = request.form.get('room_id')
-            print('Data:' + meeting_id, meeting_date, meeting_time, duration, description, club_id, room_id)
-            
-            if meeting_id:
+            logger.debug('Meeting form meeting_id=%s date=%s time=%s duration=%s club_id=%s room_id=%s',
+                         meeting_id, meeting_date, meeting_time, duration, club_id, room_id)
+
+            # Refuse bookings that overlap another meeting in the room or that the
+            # room cannot seat
+            booking_errors = check_booking(meeting_id, meeting_date, meeting_time, duration, room_id, club_id)
+            if booking_errors:
+                for message in booking_errors:
+                    flash(message, 'error')
+                    logger.warning('Booking rejected meeting_id=%s reason=%s', meeting_id, message)
+
+            elif meeting_id:
                 # Edit existing meeting
                 meeting = Meetings.query.get(meeting_id)
-                print('Meeting:', meeting)
                 if meeting:
                     # Update meeting with new details from the form
                     meeting.date = meeting_date
@@ -174,11 +1246,11 @@ def add_edit_delete():
                     try:
                         db.session.commit()
                         flash('Meeting updated successfully!', 'success')
-                        print('Meeting updated successfully!')
+                        logger.info('Meeting updated meeting_id=%s', meeting_id)
                     except Exception as e:
                         db.session.rollback()
                         flash('Failed to update. Error: ' + str(e), 'error')
-                        print('Failed to update. Error: ' + str(e))
+                        logger.error('Meeting update failed meeting_id=%s error=%s', meeting_id, e)
                 else:
                     # Meeting not found, create a new meeting instead
                     new_meeting = Meetings(
@@ -195,20 +1267,20 @@ def add_edit_delete():
                         db.session.add(new_meeting)
                         db.session.commit()
                         flash('Meeting added successfully!', 'success')
-                        print('Meeting added successfully!')
+                        logger.info('Meeting added meeting_id=%s', meeting_id)
                     except Exception as e:
                         db.session.rollback()
                         flash('Failed to add. Error: ' + str(e), 'error')
-                        print('Failed to add. Error: ' + str(e))
+                        logger.error('Meeting add failed meeting_id=%s error=%s', meeting_id, e)
                     
 
                     
             
         #return redirect(url_for('add_edit_delete'))
 
-    # GET request logic remains the same for fetching clubs and rooms
-    clubs = Club.query.all()
-    rooms = Room.query.all()
+    # Clubs and rooms for the form's dropdowns come from the reference cache
+    clubs = reference_cache.get('clubs')
+    rooms = reference_cache.get('rooms')
     return render_template('add_edit_delete.html', clubs=clubs, rooms=rooms)
 
 
@@ -277,6 +1349,419 @@ def manage_organizers():
     return render_template('manage_organizers.html', meetings=meetings, students=students)
 """
 
+# Condition matching meetings in room_id (a value or a correlated column) that
+# overlap [start_at, end_at). Meetings last at most MAX_MEETING_MINUTES, so only
+# those starting within that window before start_at can overlap, which keeps the
+# lookup a short range of the (room_id, start_at) index instead of a scan of
+# the room's meetings.
+def room_busy_clause(room_id, start_at, end_at):
+    earliest_start = start_at - timedelta(minutes=app.config['MAX_MEETING_MINUTES'])
+    return and_(
+        Meetings.room_id == room_id,
+        Meetings.start_at > earliest_start,
+        Meetings.start_at < end_at,
+        Meetings.end_at > start_at
+    )
+
+# Ids of meetings in room_id overlapping [start_at, end_at)
+def find_room_conflicts(room_id, start_at, end_at, exclude_meeting_id=None):
+    query = db.session.query(Meetings.id).filter(room_busy_clause(room_id, start_at, end_at))
+    if exclude_meeting_id is not None:
+        query = query.filter(Meetings.id != exclude_meeting_id)
+    return [row.id for row in query.order_by(Meetings.start_at)]
+
+# Validate a meeting booking from the add/edit form and return a list of error
+# messages, empty when the booking can be saved
+def check_booking(meeting_id, meeting_date, meeting_time, duration, room_id, club_id=None):
+    try:
+        meeting_id = as_int(meeting_id)
+    except ValueError:
+        return ['Meeting ID must be a whole number.']
+    try:
+        room_id = as_int(room_id)
+    except ValueError:
+        return ['Room must be chosen from the list.']
+    try:
+        as_int(club_id)
+    except ValueError:
+        return ['Club must be chosen from the list.']
+    try:
+        duration = int(duration)
+    except (TypeError, ValueError):
+        return ['Duration must be a whole number of minutes.']
+    if not 0 < duration <= app.config['MAX_MEETING_MINUTES']:
+        return [f"Duration must be between 1 and {app.config['MAX_MEETING_MINUTES']} minutes."]
+    if meeting_date is None or meeting_time is None or not room_id:
+        return []
+
+    errors = []
+    start_at, end_at = meeting_interval(meeting_date, meeting_time, duration)
+    exclude_meeting_id = meeting_id
+    conflicts = find_room_conflicts(room_id, start_at, end_at, exclude_meeting_id)
+    if conflicts:
+        errors.append('Room is already booked at that time by meeting(s) ' + ', '.join(map(str, conflicts)) + '.')
+
+    # An existing meeting moving rooms must still fit everyone who said yes
+    if exclude_meeting_id is not None:
+        room = db.session.get(Room, room_id)
+        yes_count = db.session.query(MeetingRSVPCounts.yes_count).filter_by(meeting_id=exclude_meeting_id).scalar() or 0
+        if room and room.max_capacity is not None and yes_count > room.max_capacity:
+            errors.append(f'Room capacity is {room.max_capacity} but {yes_count} students have accepted.')
+    return errors
+
+# Rooms seating at least min_capacity with nothing booked in [start_at, end_at),
+# smallest adequate room first. One statement: the capacity index supplies the
+# rooms in order and each is probed with the room_busy_clause index range, so
+# the search stops as soon as `limit` free rooms are found.
+def find_free_rooms(start_at, end_at, min_capacity=0, limit=10):
+    return free_rooms_query(start_at, end_at, min_capacity).limit(limit).all()
+
+def free_rooms_query(start_at, end_at, min_capacity=0):
+    busy = select(Meetings.id).where(room_busy_clause(Room.id, start_at, end_at)).exists()
+    return db.session.query(Room.id, Room.building, Room.number, Room.max_capacity).filter(
+        Room.max_capacity >= min_capacity,
+        ~busy
+    ).order_by(Room.max_capacity, Room.id)
+
+# Route to find free rooms for a meeting slot:
+# /rooms/available?date=2024-03-01&time=14:00&duration=60&min_capacity=20
+@app.route('/rooms/available')
+def available_rooms():
+    try:
+        start_at = datetime.strptime(f"{request.args['date']} {request.args['time']}", '%Y-%m-%d %H:%M')
+        duration = int(request.args['duration'])
+        min_capacity = int(request.args.get('min_capacity') or 0)
+        limit = min(max(int(request.args.get('limit', SEARCH_LIMIT)), 1), SEARCH_LIMIT_MAX)
+    except (KeyError, ValueError):
+        return jsonify(message='date (YYYY-MM-DD), time (HH:MM) and duration (minutes) are required.'), 400
+    if not 0 < duration <= app.config['MAX_MEETING_MINUTES']:
+        return jsonify(message=f"duration must be between 1 and {app.config['MAX_MEETING_MINUTES']} minutes."), 400
+
+    rooms = find_free_rooms(start_at, start_at + timedelta(minutes=duration), min_capacity, limit)
+    return jsonify(rooms=[
+        dict(id=room.id, label=f'{room.building} - {room.number}', building=room.building, number=room.number,
+             max_capacity=room.max_capacity, spare_seats=room.max_capacity - min_capacity)
+        for room in rooms
+    ])
+
+# Route to list every double booking and over-capacity meeting in a date range,
+# optionally for one room: /conflicts?start=2024-01-01&end=2024-05-31&room_id=2
+@app.route('/conflicts')
+def list_conflicts():
+    try:
+        range_start = datetime.strptime(request.args['start'], '%Y-%m-%d')
+        range_end = datetime.strptime(request.args['end'], '%Y-%m-%d') + timedelta(days=1)
+        room_id = as_int(request.args.get('room_id'))
+    except (KeyError, ValueError):
+        return jsonify(message='start and end dates (YYYY-MM-DD) are required.'), 400
+
+    # Pair each meeting in the range with the later-starting meetings in the same
+    # room that begin before it ends, the same index range as find_room_conflicts
+    first = aliased(Meetings)
+    second = aliased(Meetings)
+    overlaps = db.session.query(
+        first.room_id, first.id.label('meeting_id'), second.id.label('other_meeting_id'),
+        second.start_at.label('overlap_start'),
+        type_coerce(func.min(first.end_at, second.end_at), db.DateTime).label('overlap_end')
+    ).join(second, and_(
+        second.room_id == first.room_id,
+        second.start_at >= first.start_at,
+        second.start_at < first.end_at,
+        second.id != first.id,
+        or_(second.start_at > first.start_at, second.id > first.id)
+    )).filter(
+        first.start_at > range_start - timedelta(minutes=app.config['MAX_MEETING_MINUTES']),
+        first.start_at < range_end,
+        first.end_at > range_start
+    )
+
+    over_capacity = db.session.query(
+        Meetings.room_id, Meetings.id.label('meeting_id'), MeetingRSVPCounts.yes_count, Room.max_capacity
+    ).join(MeetingRSVPCounts, MeetingRSVPCounts.meeting_id == Meetings.id).join(Room, Room.id == Meetings.room_id).filter(
+        Meetings.start_at >= range_start,
+        Meetings.start_at < range_end,
+        MeetingRSVPCounts.yes_count > Room.max_capacity
+    )
+
+    if room_id is not None:
+        overlaps = overlaps.filter(first.room_id == room_id)
+        over_capacity = over_capacity.filter(Meetings.room_id == room_id)
+
+    return jsonify(
+        overlaps=[
+            dict(room_id=row.room_id, meeting_id=row.meeting_id, other_meeting_id=row.other_meeting_id,
+                 overlap_start=row.overlap_start.isoformat(), overlap_end=row.overlap_end.isoformat())
+            for row in overlaps.order_by(first.start_at, first.id)
+        ],
+        over_capacity=[
+            dict(room_id=row.room_id, meeting_id=row.meeting_id, yes_count=row.yes_count,
+                 max_capacity=row.max_capacity)
+            for row in over_capacity.order_by(Meetings.start_at)
+        ]
+    )
+
+
+# Longest recurring series one request may create, and the weeks between
+# occurrences for each recurrence rule
+MAX_SERIES_OCCURRENCES = 200
+SERIES_RULES = {'weekly': 1, 'biweekly': 2}
+# Columns of a meeting import file; id is optional and assigned when blank
+MEETING_IMPORT_COLUMNS = ('id', 'date', 'time', 'duration', 'description', 'club_id', 'room_id')
+
+# Parse one meeting from form, JSON or CSV values into a row for the meeting
+# table, raising ValueError with a message for the user
+def parse_meeting_values(values):
+    def field(name):
+        value = values.get(name)
+        return str(value).strip() if value is not None else ''
+
+    try:
+        meeting_date = datetime.strptime(field('date'), '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('date must be YYYY-MM-DD.')
+    meeting_time = None
+    for time_format in ('%H:%M', '%H:%M:%S'):
+        try:
+            meeting_time = datetime.strptime(field('time'), time_format).time()
+            break
+        except ValueError:
+            pass
+    if meeting_time is None:
+        raise ValueError('time must be HH:MM.')
+    try:
+        duration = int(field('duration'))
+    except ValueError:
+        raise ValueError('duration must be a whole number of minutes.')
+    if not 0 < duration <= app.config['MAX_MEETING_MINUTES']:
+        raise ValueError(f"duration must be between 1 and {app.config['MAX_MEETING_MINUTES']} minutes.")
+    try:
+        meeting_id = as_int(field('id'))
+        club_id = int(field('club_id'))
+        room_id = int(field('room_id'))
+    except ValueError:
+        raise ValueError('id, club_id and room_id must be numbers; club_id and room_id are required.')
+
+    start_at, end_at = meeting_interval(meeting_date, meeting_time, duration)
+    return dict(id=meeting_id, date=meeting_date, time=meeting_time, duration=duration,
+                description=field('description'), club_id=club_id, room_id=room_id,
+                start_at=start_at, end_at=end_at)
+
+# Dates of a recurring series from first_date through until, every `weeks` weeks
+def expand_series(first_date, until, weeks):
+    occurrences = []
+    meeting_date = first_date
+    while meeting_date <= until:
+        occurrences.append(meeting_date)
+        meeting_date += timedelta(weeks=weeks)
+    return occurrences
+
+# Check new meeting rows, given as (label, row) pairs, against the database and
+# each other before anything is written. Returns (label, message) errors, empty
+# when every row can be inserted. Each room touched is read once over the span
+# of the new rows instead of running the overlap check row by row.
+def validate_new_meetings(rows):
+    errors = []
+    club_ids = {row['club_id'] for _, row in rows}
+    room_ids = {row['room_id'] for _, row in rows}
+    known_clubs = {c.id for c in db.session.query(Club.id).filter(Club.id.in_(club_ids))}
+    known_rooms = {r.id for r in db.session.query(Room.id).filter(Room.id.in_(room_ids))}
+
+    explicit_ids = [row['id'] for _, row in rows if row['id'] is not None]
+    taken_ids = set()
+    for i in range(0, len(explicit_ids), BULK_INSERT_BATCH_SIZE):
+        batch = explicit_ids[i:i + BULK_INSERT_BATCH_SIZE]
+        taken_ids.update(m.id for m in db.session.query(Meetings.id).filter(Meetings.id.in_(batch)))
+
+    seen_ids = set()
+    by_room = {}
+    for label, row in rows:
+        if row['club_id'] not in known_clubs:
+            errors.append((label, f"Club {row['club_id']} does not exist."))
+        if row['room_id'] not in known_rooms:
+            errors.append((label, f"Room {row['room_id']} does not exist."))
+        if row['id'] is not None:
+            if row['id'] in taken_ids:
+                errors.append((label, f"Meeting {row['id']} already exists."))
+            elif row['id'] in seen_ids:
+                errors.append((label, f"Meeting {row['id']} appears more than once."))
+            seen_ids.add(row['id'])
+        by_room.setdefault(row['room_id'], []).append((label, row))
+
+    # Sweep each room's existing and new bookings in start order; anything still
+    # running when a booking starts overlaps it
+    max_minutes = timedelta(minutes=app.config['MAX_MEETING_MINUTES'])
+    for room_id, room_rows in by_room.items():
+        if room_id not in known_rooms:
+            continue
+        span_start = min(row['start_at'] for _, row in room_rows)
+        span_end = max(row['end_at'] for _, row in room_rows)
+        existing = db.session.query(Meetings.id, Meetings.start_at, Meetings.end_at).filter(
+            Meetings.room_id == room_id,
+            Meetings.start_at > span_start - max_minutes,
+            Meetings.start_at < span_end,
+            Meetings.end_at > span_start
+        )
+        bookings = [(m.start_at, m.end_at, None, f'meeting {m.id}') for m in existing]
+        bookings += [(row['start_at'], row['end_at'], label, f'row {label}') for label, row in room_rows]
+        bookings.sort(key=lambda booking: booking[0])
+
+        clashes = {}
+        running = []
+        for start_at, end_at, label, name in bookings:
+            running = [booking for booking in running if booking[1] > start_at]
+            for _, _, other_label, other_name in running:
+                if label is not None:
+                    clashes.setdefault(label, []).append(other_name)
+                if other_label is not None:
+                    clashes.setdefault(other_label, []).append(name)
+            running.append((start_at, end_at, label, name))
+        for label, _ in room_rows:
+            if label in clashes:
+                errors.append((label, f'Room {room_id} is already booked at that time by '
+                                      + ', '.join(clashes[label]) + '.'))
+    return errors
+
+# Insert validated meeting rows in batches inside the caller's transaction
+def insert_meetings(rows):
+    table = Meetings.__table__
+    for i in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        batch = rows[i:i + BULK_INSERT_BATCH_SIZE]
+        # Rows with and without an id go in separate statements so SQLite
+        # assigns the missing ones
+        for has_id in (True, False):
+            values = [row if has_id else {k: v for k, v in row.items() if k != 'id'}
+                      for row in batch if (row['id'] is not None) == has_id]
+            if values:
+                db.session.execute(table.insert(), values)
+    # Core inserts skip the flush hooks, so mark the report cache here
+    report_cache_pending(db.session)['slots'].update(
+        (row['date'], row['club_id'], row['room_id']) for row in rows
+    )
+
+# Validate every row, then insert them all in one transaction. Nothing is
+# written if any row fails. Returns (inserted, errors).
+def create_meetings(rows):
+    errors = validate_new_meetings(rows)
+    if errors:
+        return 0, errors
+    try:
+        insert_meetings([row for _, row in rows])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return len(rows), []
+
+# Shared response for the series and import routes: JSON for API callers, or
+# flashed messages and a redirect back to the meetings page for the forms
+def meeting_batch_response(from_form, message, category, status_code, errors=(), **payload):
+    if from_form:
+        flash(message, category)
+        for label, error in list(errors)[:20]:
+            flash(f'{label}: {error}', 'error')
+        logger.info('Meeting batch result=%s errors=%d', message, len(errors))
+        return redirect(url_for('add_edit_delete'))
+    return jsonify(message=message, errors=[dict(row=label, error=error) for label, error in errors],
+                   **payload), status_code
+
+# Route to create a weekly or biweekly series of meetings up to an end date:
+# date, time, duration, description, club_id, room_id, repeat and until
+@app.route('/meetings/series', methods=['POST'])
+def create_meeting_series():
+    from_form = not request.is_json
+    values = request.get_json(silent=True) if request.is_json else request.form
+    if not isinstance(values, dict) and not from_form:
+        return meeting_batch_response(from_form, 'Request body must be a JSON object.', 'error', 400)
+    try:
+        first = parse_meeting_values(values)
+    except ValueError as e:
+        return meeting_batch_response(from_form, str(e), 'error', 400)
+    weeks = SERIES_RULES.get(values.get('repeat') or 'weekly')
+    if weeks is None:
+        return meeting_batch_response(from_form, 'repeat must be weekly or biweekly.', 'error', 400)
+    try:
+        until = datetime.strptime(str(values.get('until') or '').strip(), '%Y-%m-%d').date()
+    except ValueError:
+        return meeting_batch_response(from_form, 'until must be YYYY-MM-DD.', 'error', 400)
+    if first['id'] is not None:
+        return meeting_batch_response(from_form, 'Series meetings are numbered automatically; leave id out.',
+                                      'error', 400)
+
+    occurrences = expand_series(first['date'], until, weeks)
+    if not occurrences:
+        return meeting_batch_response(from_form, 'until must not be before the first date.', 'error', 400)
+    if len(occurrences) > MAX_SERIES_OCCURRENCES:
+        return meeting_batch_response(
+            from_form, f'A series may have at most {MAX_SERIES_OCCURRENCES} meetings.', 'error', 400)
+
+    rows = []
+    for meeting_date in occurrences:
+        start_at, end_at = meeting_interval(meeting_date, first['time'], first['duration'])
+        rows.append((meeting_date.isoformat(), dict(first, date=meeting_date, start_at=start_at, end_at=end_at)))
+
+    try:
+        inserted, errors = create_meetings(rows)
+    except Exception as e:
+        logger.error('Meeting series failed error=%s', e)
+        return meeting_batch_response(from_form, 'Failed to create the series. Error: ' + str(e), 'error', 500)
+    if errors:
+        return meeting_batch_response(from_form, 'No meetings were created; fix the dates below.', 'error', 400,
+                                      errors)
+    logger.info('Meeting series created count=%d room_id=%s', inserted, first['room_id'])
+    return meeting_batch_response(from_form, f'{inserted} meeting(s) created.', 'success', 200,
+                                  inserted=inserted, dates=[label for label, _ in rows])
+
+# Route to import meetings from a CSV upload (header row with the
+# MEETING_IMPORT_COLUMNS) or a JSON body {"meetings": [{...}, ...]}. Every row
+# is validated first, and the import is all-or-nothing.
+@app.route('/meetings/import', methods=['POST'])
+def import_meetings():
+    from_form = not request.is_json
+    if request.is_json:
+        data = request.get_json(silent=True)
+        meetings = (data.get('meetings') or []) if isinstance(data, dict) else None
+        if not isinstance(meetings, list):
+            return meeting_batch_response(from_form, 'Request body must be an object with a meetings list.',
+                                          'error', 400)
+        records = [(number, values) for number, values in enumerate(meetings, 1)]
+    else:
+        upload = request.files.get('meeting_file')
+        if not upload or not upload.filename:
+            return meeting_batch_response(from_form, 'Choose a CSV file to import.', 'error', 400)
+        try:
+            reader = csv.DictReader(io.StringIO(upload.read().decode('utf-8-sig')))
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            missing = [name for name in MEETING_IMPORT_COLUMNS if name != 'id' and name not in reader.fieldnames]
+            if missing:
+                return meeting_batch_response(from_form, 'Missing column(s): ' + ', '.join(missing) + '.',
+                                              'error', 400)
+            # Line numbers count the header, so they match the file in an editor
+            records = [(reader.line_num, values) for values in reader]
+        except (UnicodeDecodeError, csv.Error):
+            return meeting_batch_response(from_form, 'The file must be a UTF-8 encoded CSV.', 'error', 400)
+
+    rows, errors = [], []
+    for number, values in records:
+        try:
+            rows.append((number, parse_meeting_values(values)))
+        except (ValueError, AttributeError) as e:
+            errors.append((number, str(e) if isinstance(e, ValueError) else 'Expected an object.'))
+    if not records:
+        return meeting_batch_response(from_form, 'No meetings to import.', 'error', 400)
+
+    try:
+        inserted, row_errors = create_meetings(rows) if not errors else (0, validate_new_meetings(rows))
+    except Exception as e:
+        logger.error('Meeting import failed error=%s', e)
+        return meeting_batch_response(from_form, 'Failed to import meetings. Error: ' + str(e), 'error', 500)
+    errors = sorted(errors + row_errors, key=lambda error: error[0])
+    if errors:
+        return meeting_batch_response(from_form, f'No meetings were imported; {len(errors)} problem(s) found.',
+                                      'error', 400, errors)
+    logger.info('Meetings imported count=%d', inserted)
+    return meeting_batch_response(from_form, f'{inserted} meeting(s) imported.', 'success', 200, inserted=inserted)
+
+
 # Route to manage organizers for a meeting
 @app.route('/manage_organizers', methods=['GET', 'POST'])
 def manage_organizers():
@@ -292,7 +1777,7 @@ def manage_organizers():
 
         if not meeting_exists or not student_exists:
             flash('Meeting or Student not found.', 'error')
-            print('Meeting or Student not found.')
+            logger.warning('Organizer meeting or student not found meeting_id=%s student_id=%s', meeting_id, student_id)
             return redirect(url_for('manage_organizers'))
 
         if action == 'add':
@@ -312,11 +1797,11 @@ def manage_organizers():
                 db.session.execute(stmt, {'meeting_id': meeting_id, 'student_id': student_id})
                 db.session.commit()
                 flash('Organizer added successfully!', 'success')
-                print('Organizer added successfully!')
+                logger.info('Organizer added meeting_id=%s student_id=%s', meeting_id, student_id)
             except Exception as e:
                 db.session.rollback()
                 flash('Failed to delete. Error: ' + str(e), 'error')
-                print('Failed to delete. Error: ' + str(e))
+                logger.error('Organizer add failed meeting_id=%s student_id=%s error=%s', meeting_id, student_id, e)
             
 
         elif action == 'delete':
@@ -329,19 +1814,17 @@ def manage_organizers():
                 try:
                     db.session.commit()
                     flash('Organizer deleted successfully!', 'success')
-                    print('Organizer deleted successfully!')
+                    logger.info('Organizer deleted meeting_id=%s student_id=%s', meeting_id, student_id)
                 except Exception as e:
                     db.session.rollback()
                     flash('Failed to delete. Error: ' + str(e), 'error')
-                    print('Failed to delete. Error: ' + str(e))
+                    logger.error('Organizer delete failed meeting_id=%s student_id=%s error=%s', meeting_id, student_id, e)
             else:
                 flash('Organizer not found.', 'error')
-                print('Organizer not found.')
+                logger.warning('Organizer not found meeting_id=%s student_id=%s', meeting_id, student_id)
 
-    # Fetch all meetings and students to populate the form dropdowns
-    meetings = Meetings.query.all()
-    students = Student.query.all()
-    return render_template('manage_organizers.html', meetings=meetings, students=students)
+    # Meetings and students are picked through the /search typeahead endpoints
+    return render_template('manage_organizers.html')
 
 
 # Route to manage RSVPs for meeting invitations
@@ -352,14 +1835,14 @@ def invites_rsvps():
         meeting_id = request.form.get('meeting_id')
         student_id = request.form.get('student_id')
         action = request.form.get('action')
-        print('Data:', meeting_id, student_id, action)
+        logger.debug('invites_rsvps action=%s meeting_id=%s student_id=%s', action, meeting_id, student_id)
 
         if action == 'Send Invitation':
             # Check if an RSVP already exists for this combination of meeting_id and student_id
             rsvp = RSVPs.query.filter_by(meeting_id=meeting_id, student_id=student_id).first()
             if rsvp:
                 flash('RSVP already exists for this student.', 'warning')
-                print('RSVP already exists for this student.')
+                logger.warning('RSVP already exists meeting_id=%s student_id=%s', meeting_id, student_id)
                 return redirect(url_for('invites_rsvps'))
             else:
                 # Create a new RSVP entry with a default status of 'MAYBE'
@@ -371,31 +1854,38 @@ def invites_rsvps():
 
                 try:
                     db.session.add(new_rsvp)
+                    adjust_rsvp_rollup(meeting_id, new_status=RSVPStatus.maybe)
+                    enqueue_invitation(meeting_id, student_id)
                     db.session.commit()
                     flash('Invitation sent successfully!', 'success')
-                    print('Invitation sent successfully!')
+                    logger.info('Invitation sent meeting_id=%s student_id=%s', meeting_id, student_id)
                 except Exception as e:
                     db.session.rollback()
                     flash('Failed to send invitation. Error: ' + str(e), 'error')
-                    print('Failed to send invitation. Error: ' + str(e))
+                    logger.error('Invitation failed meeting_id=%s student_id=%s error=%s', meeting_id, student_id, e)
 
         elif action == 'Record Response':
-            rsvp_status = request.form.get('rsvp_status').lower()
-            # Update the existing RSVP entry with the new status
-            rsvp = RSVPs.query.filter_by(meeting_id=meeting_id, student_id=student_id).first()
-            if rsvp:
-                rsvp.status = RSVPStatus(rsvp_status)
+            rsvp_status = (request.form.get('rsvp_status') or '').strip().lower()
+            if rsvp_status not in RSVPStatus.__members__:
+                flash('Choose a response: ' + ', '.join(RSVPStatus.__members__) + '.', 'error')
+                logger.warning('RSVP response without a valid status meeting_id=%s student_id=%s status=%r',
+                               meeting_id, student_id, rsvp_status)
+            else:
+                # Same service as the JSON /rsvps/responses API, with a batch of one
                 try:
+                    _, _, not_found = apply_rsvp_responses([(int(meeting_id), int(student_id), RSVPStatus(rsvp_status))])
                     db.session.commit()
-                    flash('RSVP response recorded!', 'success')
-                    print('RSVP response recorded!')
                 except Exception as e:
                     db.session.rollback()
                     flash('Failed to record RSVP response. Error: ' + str(e), 'error')
-                    print('Failed to record RSVP response. Error: ' + str(e))
-            else:
-                flash('RSVP not found.', 'error')
-                print('RSVP not found.')
+                    logger.error('RSVP response failed meeting_id=%s student_id=%s error=%s', meeting_id, student_id, e)
+                else:
+                    if not_found:
+                        flash('RSVP not found.', 'error')
+                        logger.warning('RSVP not found meeting_id=%s student_id=%s', meeting_id, student_id)
+                    else:
+                        flash('RSVP response recorded!', 'success')
+                        logger.info('RSVP response recorded meeting_id=%s student_id=%s status=%s', meeting_id, student_id, rsvp_status)
 
         elif action == 'Delete RSVP':
             # Delete the RSVP entry
@@ -403,91 +1893,1098 @@ def invites_rsvps():
             if rsvp:
                 try:
                     db.session.delete(rsvp)
+                    adjust_rsvp_rollup(meeting_id, old_status=rsvp.status)
                     db.session.commit()
                     flash('RSVP deleted successfully!', 'success')
-                    print('RSVP deleted successfully!')
+                    logger.info('RSVP deleted meeting_id=%s student_id=%s', meeting_id, student_id)
                 except Exception as e:
                     db.session.rollback()
                     flash('Failed to delete. Error: ' + str(e), 'error')
-                    print('Failed to delete. Error: ' + str(e))
+                    logger.error('RSVP delete failed meeting_id=%s student_id=%s error=%s', meeting_id, student_id, e)
                 
             else:
                 flash('RSVP not found.', 'error')
-                print('RSVP not found.')
+                logger.warning('RSVP not found meeting_id=%s student_id=%s', meeting_id, student_id)
 
         else:
             flash('Invalid action.', 'error')
-            print('Invalid action.')
+            logger.warning('Invalid invites_rsvps action=%s', action)
 
-    # Prepare data for GET requests or after form submission
-    meetings = Meetings.query.all()
-    students = Student.query.all()
-    # Optionally, include RSVPs to show current invites and responses
-    rsvps = RSVPs.query.join(Meetings).join(Student).all()
+    # Meetings and students are picked through the /search typeahead endpoints.
+    # Show one page of current invites and responses, filtered by the query string
+    try:
+        rsvps, next_cursor = rsvp_page(**rsvp_page_args(request.args))
+    except ValueError as e:
+        flash(str(e), 'error')
+        rsvps, next_cursor = rsvp_page()
+
+    return render_template('invites_rsvps.html', rsvps=rsvps, next_cursor=next_cursor, rsvp_filters=request.args)
+
+
+# Default and largest number of RSVPs returned by one page of the listing
+RSVP_PAGE_SIZE = 50
+RSVP_PAGE_SIZE_MAX = 200
+
+# Fetch one page of RSVPs ordered by (meeting_id, student_id). The cursor is the
+# "meeting_id:student_id" of the last row of the previous page, so each page is
+# an index range read of page-size rows however many RSVPs exist. Only the
+# columns the listing shows are selected, which avoids the lazy meeting/student
+# loads. Returns the rows and the cursor for the next page, or None at the end.
+def rsvp_page(meeting_id=None, student_id=None, status=None, cursor=None, limit=RSVP_PAGE_SIZE):
+    # Read one extra row to learn whether another page follows
+    rows = rsvp_page_query(meeting_id, student_id, status, cursor).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, f'{rows[-1].meeting_id}:{rows[-1].student_id}'
+
+# Query behind rsvp_page, ordered by (meeting_id, student_id) for the cursor
+def rsvp_page_query(meeting_id=None, student_id=None, status=None, cursor=None):
+    query = db.session.query(
+        RSVPs.meeting_id,
+        RSVPs.student_id,
+        RSVPs.status,
+        Meetings.date,
+        Meetings.time,
+        Student.name.label('student_name')
+    ).join(Meetings, Meetings.id == RSVPs.meeting_id).join(Student, Student.id == RSVPs.student_id)
+
+    if meeting_id is not None:
+        query = query.filter(RSVPs.meeting_id == meeting_id)
+    if student_id is not None:
+        query = query.filter(RSVPs.student_id == student_id)
+    if status is not None:
+        query = query.filter(RSVPs.status == status.name)
+    if cursor is not None:
+        query = query.filter(tuple_(RSVPs.meeting_id, RSVPs.student_id) > tuple_(*cursor))
+    return query.order_by(RSVPs.meeting_id, RSVPs.student_id)
+
+# Convert listing filters from a query string into rsvp_page arguments, raising
+# ValueError on anything malformed
+def rsvp_page_args(args):
+    page_args = {}
+    try:
+        for name in ('meeting_id', 'student_id'):
+            if args.get(name):
+                page_args[name] = int(args[name])
+        if args.get('cursor'):
+            meeting_id, student_id = args['cursor'].split(':')
+            page_args['cursor'] = (int(meeting_id), int(student_id))
+        if args.get('limit'):
+            page_args['limit'] = min(max(int(args['limit']), 1), RSVP_PAGE_SIZE_MAX)
+    except ValueError:
+        raise ValueError('Invalid RSVP listing filter.')
+
+    if args.get('status'):
+        try:
+            page_args['status'] = RSVPStatus(args['status'].lower())
+        except ValueError:
+            raise ValueError('Invalid RSVP status filter.')
+    return page_args
+
+# Route to browse RSVPs as JSON, one keyset page at a time. Accepts meeting_id,
+# student_id, status, limit and the cursor returned by the previous page.
+@app.route('/rsvps')
+def list_rsvps():
+    try:
+        rows, next_cursor = rsvp_page(**rsvp_page_args(request.args))
+    except ValueError as e:
+        return jsonify(message=str(e)), 400
+
+    return jsonify(
+        rsvps=[
+            dict(meeting_id=row.meeting_id, student_id=row.student_id, status=row.status.value,
+                 date=row.date.isoformat(), time=row.time.strftime('%H:%M'), student_name=row.student_name)
+            for row in rows
+        ],
+        next_cursor=next_cursor
+    )
+
+
+# Largest number of students bound into one bulk insert statement, well under
+# SQLite's limit on host parameters
+BULK_INSERT_BATCH_SIZE = 500
+
+# Invite every student in student_ids to a meeting in one transaction. Students
+# that already have an RSVP, or that do not exist, are skipped. Returns the
+# (inserted, skipped) counts.
+def bulk_invite(meeting_id, student_ids):
+    student_ids = list(dict.fromkeys(student_ids))
+    inserted = 0
+    try:
+        for i in range(0, len(student_ids), BULK_INSERT_BATCH_SIZE):
+            batch = student_ids[i:i + BULK_INSERT_BATCH_SIZE]
+            # INSERT ... SELECT FROM student keeps unknown ids out, and the NOT
+            # EXISTS skips existing invitations without a lookup per student
+            already_invited = select(RSVPs.student_id).where(
+                RSVPs.meeting_id == meeting_id, RSVPs.student_id == Student.id
+            ).exists()
+            # Queue the notifications first, while the NOT EXISTS still selects
+            # exactly the students this batch is about to invite
+            enqueue_invitations(meeting_id, Student.id.in_(batch), ~already_invited)
+            source = select(
+                literal(meeting_id), Student.id, literal(RSVPStatus.maybe.name)
+            ).where(Student.id.in_(batch), ~already_invited)
+            stmt = RSVPs.__table__.insert().from_select(['meeting_id', 'student_id', 'status'], source)
+            inserted += db.session.execute(stmt).rowcount
+        if inserted:
+            adjust_rsvp_rollup(meeting_id, new_status=RSVPStatus.maybe, count=inserted)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return inserted, len(student_ids) - inserted
+
+# Collect student ids for a bulk invitation from a JSON body, a CSV/JSON file
+# upload, or a comma/whitespace separated form field. Raises ValueError for
+# anything that is not a list of whole-number ids.
+def parse_bulk_student_ids():
+    if request.is_json:
+        return json_student_ids(request.get_json(silent=True), allow_list=False)
+
+    upload = request.files.get('student_file')
+    if upload and upload.filename:
+        content = upload.read().decode('utf-8-sig')
+        if upload.filename.lower().endswith('.json'):
+            return json_student_ids(json.loads(content), allow_list=True)
+        # CSV: use the student_id column when there is a header, else the first column
+        rows = list(csv.reader(io.StringIO(content)))
+        column = 0
+        if rows and 'student_id' in [cell.strip().lower() for cell in rows[0]]:
+            column = [cell.strip().lower() for cell in rows[0]].index('student_id')
+            rows = rows[1:]
+        if any(row and len(row) <= column for row in rows):
+            raise ValueError('A CSV row has no student_id value.')
+        return [int(row[column]) for row in rows if row and row[column].strip()]
+
+    raw = request.form.get('student_ids', '')
+    return [int(s) for s in raw.replace(',', ' ').split()]
+
+# The ids in a parsed JSON document: an object with a student_ids list, or, for
+# an uploaded file, the bare list. Strings, floats and booleans are rejected
+# rather than coerced, so "23" is not read as students 2 and 3.
+def json_student_ids(data, allow_list):
+    if isinstance(data, dict):
+        data = data.get('student_ids')
+    elif not (allow_list and isinstance(data, list)):
+        raise ValueError('Expected an object with a student_ids list.')
+    if not isinstance(data, list) or not all(isinstance(s, int) and not isinstance(s, bool) for s in data):
+        raise ValueError('student_ids must be a list of whole numbers.')
+    return data
+
+# Route to invite a list of students to one meeting. Answers JSON, or flashes
+# and redirects when submitted from the invites page.
+@app.route('/invites_rsvps/bulk', methods=['POST'])
+def bulk_invites():
+    from_form = not request.is_json and request.form.get('action') == 'Bulk Invite'
+    data = request.get_json(silent=True) if request.is_json else None
+    if request.is_json and not isinstance(data, dict):
+        return jsonify(message='Request body must be a JSON object.'), 400
+    meeting_id = data.get('meeting_id') if request.is_json else request.form.get('meeting_id')
+
+    def respond(message, category, status_code, **payload):
+        if from_form:
+            flash(message, category)
+            logger.info('Bulk invite meeting_id=%s result=%s', meeting_id, message)
+            return redirect(url_for('invites_rsvps'))
+        return jsonify(message=message, **payload), status_code
+
+    try:
+        meeting_id = int(meeting_id)
+        student_ids = parse_bulk_student_ids()
+    except (TypeError, ValueError):
+        return respond('A meeting and a list of numeric student IDs are required.', 'error', 400)
+
+    if not db.session.query(Meetings.query.filter_by(id=meeting_id).exists()).scalar():
+        return respond('Meeting not found.', 'error', 404)
+
+    try:
+        inserted, skipped = bulk_invite(meeting_id, student_ids)
+    except Exception as e:
+        return respond('Failed to send invitations. Error: ' + str(e), 'error', 500)
+
+    return respond(f'{inserted} invitation(s) sent, {skipped} skipped.', 'success', 200,
+                   meeting_id=meeting_id, inserted=inserted, skipped=skipped)
+
+
+# Largest number of responses accepted by one /rsvps/responses request
+RSVP_RESPONSES_MAX = 10000
+
+# The (meeting_id, student_id) pairs as a VALUES table with columns column1 and
+# column2. Joined to rsv_ps, SQLite walks the list and looks each pair up by
+# primary key, where a row-value IN over the same list scans the whole table.
+def rsvp_pairs_table(pairs):
+    params = {}
+    for i, (meeting_id, student_id) in enumerate(pairs):
+        params[f'm{i}'], params[f's{i}'] = meeting_id, student_id
+    rows = ', '.join(f'(:m{i}, :s{i})' for i in range(len(pairs)))
+    return text('VALUES ' + rows).bindparams(**params).columns(
+        column1=db.Integer, column2=db.Integer).subquery('pairs')
+
+# Current status of each of the pairs that has an RSVP
+def rsvp_pairs_query(pairs):
+    pairs_table = rsvp_pairs_table(pairs)
+    return db.session.query(RSVPs.meeting_id, RSVPs.student_id, RSVPs.status).select_from(pairs_table).join(
+        RSVPs, and_(RSVPs.meeting_id == pairs_table.c.column1, RSVPs.student_id == pairs_table.c.column2))
+
+# Record a batch of (meeting_id, student_id, RSVPStatus) responses inside the
+# caller's transaction. The current statuses are read by joining batches of
+# pairs to rsv_ps, the changed rows are written with one executemany UPDATE by
+# primary key, and the per-meeting rollup deltas are summed and applied with one
+# executemany upsert. When a pair appears more than once the last response
+# wins. Returns (updated, unchanged, not_found) where not_found lists the pairs
+# that have no invitation.
+def apply_rsvp_responses(responses):
+    latest = {(meeting_id, student_id): status for meeting_id, student_id, status in responses}
+    pairs = list(latest)
+    # Each pair binds two parameters
+    batch_size = BULK_INSERT_BATCH_SIZE // 2
+
+    current = {}
+    for i in range(0, len(pairs), batch_size):
+        rows = rsvp_pairs_query(pairs[i:i + batch_size])
+        current.update(((row.meeting_id, row.student_id), row.status) for row in rows)
+
+    changes = []
+    meeting_deltas = {}
+    for (meeting_id, student_id), status in latest.items():
+        if (meeting_id, student_id) in current and current[meeting_id, student_id] != status:
+            changes.append(dict(b_meeting_id=meeting_id, b_student_id=student_id, b_status=status.name))
+            totals = meeting_deltas.setdefault(meeting_id, dict.fromkeys(ROLLUP_COUNT_COLUMNS, 0))
+            for name, delta in rsvp_rollup_deltas(current[meeting_id, student_id], status).items():
+                totals[name] += delta
+
+    if changes:
+        table = RSVPs.__table__
+        db.session.execute(table.update().where(
+            table.c.meeting_id == bindparam('b_meeting_id'), table.c.student_id == bindparam('b_student_id')
+        ).values(status=bindparam('b_status')), changes)
+    apply_rsvp_rollup_deltas(meeting_deltas)
+
+    not_found = [pair for pair in pairs if pair not in current]
+    return len(changes), len(pairs) - len(changes) - len(not_found), not_found
+
+# Parse the JSON body of /rsvps/responses into (meeting_id, student_id, status)
+# tuples, raising ValueError with a message for the client
+def parse_rsvp_responses(data):
+    entries = data.get('responses') if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError('responses must be a non-empty list.')
+    if len(entries) > RSVP_RESPONSES_MAX:
+        raise ValueError(f'At most {RSVP_RESPONSES_MAX} responses may be sent at once.')
+    responses = []
+    for index, entry in enumerate(entries):
+        try:
+            responses.append((int(entry['meeting_id']), int(entry['student_id']),
+                              RSVPStatus(str(entry['status']).lower())))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f'Response {index} needs a numeric meeting_id and student_id '
+                             f'and a status of yes, no or maybe.')
+    return responses
+
+# Stored response for an idempotency key that has not expired, or None
+def find_idempotent_response(key):
+    return idempotent_response_query(key, datetime.utcnow()).first()
+
+def idempotent_response_query(key, now):
+    cutoff = now - timedelta(seconds=app.config['IDEMPOTENCY_KEY_TTL'])
+    return IdempotencyKeys.query.filter(IdempotencyKeys.key == key, IdempotencyKeys.created_at >= cutoff)
+
+# Replay a stored response if the request body matches the original one
+def replay_idempotent_response(stored, request_hash):
+    if stored.request_hash != request_hash:
+        return jsonify(message='Idempotency-Key was already used with a different request.'), 422
+    response = app.response_class(stored.response, status=stored.status_code, mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+# Route to record a batch of RSVP responses:
+#   POST /rsvps/responses {"responses": [{"meeting_id": 1, "student_id": 2, "status": "yes"}, ...]}
+# With an Idempotency-Key header the response is stored with the writes, and a
+# retry with the same key and body gets it back without touching the RSVPs.
+@app.route('/rsvps/responses', methods=['POST'])
+def record_rsvp_responses():
+    key = request.headers.get('Idempotency-Key')
+    request_hash = hashlib.sha256(request.get_data()).hexdigest()
+    if key:
+        stored = find_idempotent_response(key)
+        if stored:
+            return replay_idempotent_response(stored, request_hash)
+
+    try:
+        responses = parse_rsvp_responses(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify(message=str(e)), 400
+
+    try:
+        updated, unchanged, not_found = apply_rsvp_responses(responses)
+        payload = dict(updated=updated, unchanged=unchanged,
+                       not_found=[dict(meeting_id=m, student_id=s) for m, s in not_found])
+        if key:
+            # Expired keys are cleared as new ones arrive, then this one is
+            # written in the same transaction as the responses
+            cutoff = datetime.utcnow() - timedelta(seconds=app.config['IDEMPOTENCY_KEY_TTL'])
+            IdempotencyKeys.query.filter(IdempotencyKeys.created_at < cutoff).delete()
+            db.session.add(IdempotencyKeys(key=key, request_hash=request_hash, status_code=200,
+                                           response=json.dumps(payload), created_at=datetime.utcnow()))
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request with the same key committed first
+        db.session.rollback()
+        stored = find_idempotent_response(key) if key else None
+        if stored is None:
+            raise
+        return replay_idempotent_response(stored, request_hash)
+    except Exception as e:
+        db.session.rollback()
+        logger.error('RSVP responses failed count=%d error=%s', len(responses), e)
+        return jsonify(message='Failed to record RSVP responses. Error: ' + str(e)), 500
+
+    logger.info('RSVP responses recorded updated=%d unchanged=%d not_found=%d', updated, unchanged, len(not_found))
+    return jsonify(payload)
+
+
+# Queue an invitation notification inside the caller's transaction, so it is
+# only ever sent for an RSVP that was committed
+def enqueue_invitation(meeting_id, student_id):
+    now = datetime.utcnow()
+    db.session.add(NotificationOutbox(kind='invitation', meeting_id=meeting_id, student_id=student_id,
+                                      status='pending', attempts=0, next_attempt_at=now, created_at=now))
+
+# Set-based form of enqueue_invitation: queue one invitation for every student
+# matching `conditions`
+def enqueue_invitations(meeting_id, *conditions):
+    now = datetime.utcnow()
+    source = select(
+        literal('invitation'), literal(meeting_id), Student.id,
+        literal('pending'), literal(0), literal(now, db.DateTime), literal(now, db.DateTime)
+    ).where(*conditions)
+    db.session.execute(NotificationOutbox.__table__.insert().from_select(
+        ['kind', 'meeting_id', 'student_id', 'status', 'attempts', 'next_attempt_at', 'created_at'], source
+    ))
+
+NOTIFICATION_SEND_BUCKETS = REQUEST_DURATION_BUCKETS
+# Seconds from enqueue to delivery, retries and backoff included
+NOTIFICATION_DELAY_BUCKETS = (1, 5, 15, 60, 300, 900, 3600, 21600)
 
-    return render_template('invites_rsvps.html', meetings=meetings, students=students, rsvps=rsvps)
+# Delivery counters and latency histograms for the notification worker
+class NotificationMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.results = {'sent': 0, 'retry': 0, 'dead': 0}
+        self.send_buckets = [0] * len(NOTIFICATION_SEND_BUCKETS)
+        self.send_time = 0.0
+        self.send_count = 0
+        self.delay_buckets = [0] * len(NOTIFICATION_DELAY_BUCKETS)
+        self.delay_total = 0.0
+
+    def record(self, result, send_seconds, delay_seconds=None):
+        with self.lock:
+            self.results[result] += 1
+            self.send_time += send_seconds
+            self.send_count += 1
+            for i, bound in enumerate(NOTIFICATION_SEND_BUCKETS):
+                if send_seconds <= bound:
+                    self.send_buckets[i] += 1
+            if delay_seconds is not None:
+                self.delay_total += delay_seconds
+                for i, bound in enumerate(NOTIFICATION_DELAY_BUCKETS):
+                    if delay_seconds <= bound:
+                        self.delay_buckets[i] += 1
+
+    def stats(self):
+        with self.lock:
+            return dict(self.results, send_seconds=round(self.send_time, 6), sends=self.send_count)
+
+    # Render the counters in the Prometheus text exposition format, with the
+    # current queue depth by status
+    def prometheus(self, depth):
+        lines = [
+            '# HELP clubhub_notification_queue_depth Outbox rows by status.',
+            '# TYPE clubhub_notification_queue_depth gauge',
+        ]
+        for status, count in sorted(depth.items()):
+            lines.append(f'clubhub_notification_queue_depth{{status="{status}"}} {count}')
+        with self.lock:
+            lines += [
+                '# HELP clubhub_notifications_total Delivery attempts, by result.',
+                '# TYPE clubhub_notifications_total counter',
+            ]
+            for result, count in sorted(self.results.items()):
+                lines.append(f'clubhub_notifications_total{{result="{result}"}} {count}')
+            for name, help_text, buckets, bounds, total, count in (
+                ('clubhub_notification_send_seconds', 'Time spent in one delivery attempt.',
+                 self.send_buckets, NOTIFICATION_SEND_BUCKETS, self.send_time, self.send_count),
+                ('clubhub_notification_delay_seconds', 'Time from enqueue to successful delivery.',
+                 self.delay_buckets, NOTIFICATION_DELAY_BUCKETS, self.delay_total, self.results['sent']),
+            ):
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for bound, bucket in zip(bounds, buckets):
+                    lines.append(f'{name}_bucket{{le="{bound}"}} {bucket}')
+                lines.append(f'{name}_bucket{{le="+Inf"}} {count}')
+                lines.append(f'{name}_sum {total:.6f}')
+                lines.append(f'{name}_count {count}')
+        return lines
+
+notification_metrics = NotificationMetrics()
+
+# Outbox rows by status, plus how many pending rows are already due
+def notification_queue_depth():
+    depth = {'pending': 0, 'dead': 0}
+    depth.update(db.session.query(NotificationOutbox.status, func.count(NotificationOutbox.id)).filter(
+        NotificationOutbox.status.in_(['pending', 'dead'])
+    ).group_by(NotificationOutbox.status).all())
+    depth['due'] = db.session.query(func.count(NotificationOutbox.id)).filter(
+        NotificationOutbox.status == 'pending', NotificationOutbox.next_attempt_at <= datetime.utcnow()
+    ).scalar()
+    return depth
+
+def send_log_notification(message):
+    logger.info('Notification to=%s subject=%s', message['to'], message['subject'])
+
+def send_smtp_notification(message):
+    email = EmailMessage()
+    email['From'] = app.config['SMTP_FROM']
+    email['To'] = message['to']
+    email['Subject'] = message['subject']
+    email.set_content(message['body'])
+    with smtplib.SMTP(app.config['SMTP_HOST'], app.config['SMTP_PORT'],
+                      timeout=app.config['NOTIFICATION_TIMEOUT_SECONDS']) as smtp:
+        smtp.send_message(email)
+
+# Fields of a claimed message posted to the webhook
+NOTIFICATION_WEBHOOK_FIELDS = ('id', 'kind', 'meeting_id', 'student_id', 'to', 'subject', 'body')
+
+def send_webhook_notification(message):
+    payload = {name: message[name] for name in NOTIFICATION_WEBHOOK_FIELDS}
+    webhook_request = urllib.request.Request(
+        app.config['NOTIFICATION_WEBHOOK_URL'], data=json.dumps(payload).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}, method='POST'
+    )
+    # Non-2xx answers raise HTTPError and count as a failed attempt
+    with urllib.request.urlopen(webhook_request, timeout=app.config['NOTIFICATION_TIMEOUT_SECONDS']) as response:
+        response.read()
+
+NOTIFICATION_SENDERS = {
+    'log': send_log_notification,
+    'smtp': send_smtp_notification,
+    'webhook': send_webhook_notification,
+}
+
+# Claim up to `limit` due outbox rows for this worker and return the claim token
+# with the messages to send. The claim is a single UPDATE, which SQLite
+# serializes, so concurrent workers never claim the same row.
+def due_notifications_query(now, limit):
+    table = NotificationOutbox.__table__
+    return select(table.c.id).where(
+        table.c.status == 'pending', table.c.next_attempt_at <= now
+    ).order_by(table.c.next_attempt_at, table.c.id).limit(limit)
+
+def claim_notifications(limit):
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    table = NotificationOutbox.__table__
+    due = due_notifications_query(now, limit)
+    claimed = db.session.execute(table.update().where(table.c.id.in_(due.scalar_subquery())).values(
+        claim_token=token, next_attempt_at=now + timedelta(seconds=app.config['NOTIFICATION_LEASE_SECONDS'])
+    )).rowcount
+    db.session.commit()
+    if not claimed:
+        return token, []
+
+    rows = db.session.query(
+        NotificationOutbox.id, NotificationOutbox.kind, NotificationOutbox.attempts, NotificationOutbox.created_at,
+        NotificationOutbox.meeting_id, NotificationOutbox.student_id, Student.name, Student.email,
+        Meetings.date, Meetings.time, Meetings.duration, Meetings.description,
+        Club.name.label('club_name'), Room.building, Room.number
+    ).outerjoin(Student, Student.id == NotificationOutbox.student_id).outerjoin(
+        Meetings, Meetings.id == NotificationOutbox.meeting_id
+    ).outerjoin(Club, Club.id == Meetings.club_id).outerjoin(Room, Room.id == Meetings.room_id).filter(
+        NotificationOutbox.claim_token == token
+    ).order_by(NotificationOutbox.id).all()
+    db.session.commit()
+
+    messages = []
+    for row in rows:
+        message = dict(id=row.id, kind=row.kind, attempts=row.attempts, created_at=row.created_at,
+                       meeting_id=row.meeting_id, student_id=row.student_id, to=row.email)
+        if row.email and row.date:
+            where = f' in {row.building} {row.number}' if row.building else ''
+            message['subject'] = f'Invitation: {row.club_name or "club"} meeting on {row.date.isoformat()}'
+            message['body'] = (f'Hi {row.name},\n\nYou are invited to {row.description or "a meeting"} '
+                               f'on {row.date.isoformat()} at {row.time.strftime("%H:%M")} '
+                               f'for {row.duration} minutes{where}.\n')
+        messages.append(message)
+    return token, messages
+
+# Send one message with the configured backend. Returns (id, error, seconds)
+# where error is None on success; messages whose student or meeting has since
+# been deleted fail permanently.
+def deliver_notification(message):
+    started = time.perf_counter()
+    if 'subject' not in message:
+        return message['id'], 'Student or meeting no longer exists.', 0.0
+    try:
+        NOTIFICATION_SENDERS[app.config['NOTIFICATION_BACKEND']](message)
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'[:500]
+    return message['id'], error, time.perf_counter() - started
+
+# Delay before retry number `attempts`: exponential backoff with jitter
+def notification_backoff(attempts):
+    delay = min(app.config['NOTIFICATION_BACKOFF_SECONDS'] * 2 ** (attempts - 1),
+                app.config['NOTIFICATION_BACKOFF_MAX_SECONDS'])
+    return delay * random.uniform(0.5, 1.0)
+
+# Write the outcome of a claimed batch in one transaction. Updates only touch
+# rows still holding this claim, so a worker whose lease ran out cannot
+# overwrite the result of the worker that took the row over.
+def record_notification_results(token, messages, results):
+    now = datetime.utcnow()
+    by_id = {message['id']: message for message in messages}
+    updates = []
+    for message_id, error, seconds in results:
+        message = by_id[message_id]
+        attempts = message['attempts'] + 1
+        if error is None:
+            result = 'sent'
+            updates.append(dict(row_id=message_id, new_status='sent', new_attempts=attempts, next_at=now,
+                                error=None, sent=now))
+        else:
+            permanent = 'subject' not in message
+            result = 'dead' if permanent or attempts >= app.config['NOTIFICATION_MAX_ATTEMPTS'] else 'retry'
+            next_at = now + timedelta(seconds=notification_backoff(attempts)) if result == 'retry' else now
+            updates.append(dict(row_id=message_id, new_status='dead' if result == 'dead' else 'pending',
+                                new_attempts=attempts, next_at=next_at, error=error, sent=None))
+            log = logger.error if result == 'dead' else logger.warning
+            log('Notification %s id=%s attempts=%d error=%s', result, message_id, attempts, error)
+        delay = (now - message['created_at']).total_seconds() if error is None else None
+        notification_metrics.record(result, seconds, delay)
+
+    table = NotificationOutbox.__table__
+    db.session.execute(table.update().where(
+        table.c.id == bindparam('row_id'), table.c.claim_token == token
+    ).values(
+        status=bindparam('new_status'), attempts=bindparam('new_attempts'), next_attempt_at=bindparam('next_at'),
+        last_error=bindparam('error'), sent_at=bindparam('sent'), claim_token=None
+    ), updates)
+    db.session.commit()
+
+# Background worker draining the notification outbox. One dispatcher thread
+# claims batches and hands the sends to a pool of NOTIFICATION_CONCURRENCY
+# threads, so slow SMTP or webhook calls never run on a request thread.
+class NotificationWorker:
+    def __init__(self):
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.run, name='notification-worker', daemon=True)
+        self.thread.start()
+        logger.info('Notification worker started backend=%s', app.config['NOTIFICATION_BACKEND'])
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout)
+
+    def run(self):
+        with ThreadPoolExecutor(max_workers=app.config['NOTIFICATION_CONCURRENCY'],
+                                thread_name_prefix='notification-send') as pool:
+            while not self.stop_event.is_set():
+                try:
+                    handled = self.drain_batch(pool)
+                except Exception:
+                    logger.exception('Notification batch failed')
+                    handled = 0
+                if not handled:
+                    self.stop_event.wait(app.config['NOTIFICATION_POLL_SECONDS'])
+
+    # Claim, send and record one batch; returns the number of rows handled
+    def drain_batch(self, pool):
+        with app.app_context():
+            token, messages = claim_notifications(app.config['NOTIFICATION_BATCH_SIZE'])
+            if messages:
+                results = list(pool.map(deliver_notification, messages))
+                record_notification_results(token, messages, results)
+            db.session.remove()
+            return len(messages)
+
+notification_worker = NotificationWorker()
+
+# Route to inspect the notification queue: depth by status, delivery counters
+# and the most recent dead letters
+@app.route('/stats/notifications')
+def notification_stats():
+    dead = NotificationOutbox.query.filter_by(status='dead').order_by(NotificationOutbox.id.desc()).limit(20)
+    return jsonify(depth=notification_queue_depth(), deliveries=notification_metrics.stats(), dead_letters=[
+        dict(id=row.id, kind=row.kind, meeting_id=row.meeting_id, student_id=row.student_id,
+             attempts=row.attempts, last_error=row.last_error, created_at=row.created_at.isoformat())
+        for row in dead
+    ])
+
+# Command line entry point to run the notification worker in its own process:
+#   flask --app app notification-worker [--once] [--requeue-dead]
+@app.cli.command('notification-worker')
+@click.option('--once', is_flag=True, help='Drain the rows that are due now, then exit.')
+@click.option('--requeue-dead', is_flag=True, help='Move dead letters back to the queue first.')
+def notification_worker_command(once, requeue_dead):
+    if requeue_dead:
+        table = NotificationOutbox.__table__
+        requeued = db.session.execute(table.update().where(table.c.status == 'dead').values(
+            status='pending', attempts=0, next_attempt_at=datetime.utcnow(), claim_token=None
+        )).rowcount
+        db.session.commit()
+        click.echo(f'{requeued} dead letter(s) requeued.')
+    if once:
+        with ThreadPoolExecutor(max_workers=app.config['NOTIFICATION_CONCURRENCY']) as pool:
+            total = 0
+            while True:
+                handled = notification_worker.drain_batch(pool)
+                if not handled:
+                    break
+                total += handled
+        click.echo(f'{total} notification(s) processed; {notification_metrics.stats()}')
+        return
+    notification_worker.start()
+    try:
+        while notification_worker.thread.is_alive():
+            notification_worker.thread.join(1)
+    except KeyboardInterrupt:
+        notification_worker.stop()
+
+
+# Default and largest number of results returned by a /search endpoint
+SEARCH_LIMIT = 10
+SEARCH_LIMIT_MAX = 50
+
+# Read the q and limit query parameters shared by the /search endpoints
+def search_args():
+    q = request.args.get('q', '').strip()
+    try:
+        limit = min(max(int(request.args.get('limit', SEARCH_LIMIT)), 1), SEARCH_LIMIT_MAX)
+    except ValueError:
+        limit = SEARCH_LIMIT
+    return q, limit
+
+# Build a LIKE pattern matching values that start with q, escaping wildcards.
+# The pattern is bound as a whole so SQLite can turn it into an index range.
+def prefix_pattern(q):
+    return q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+def prefix_match(column, q):
+    return column.like(prefix_pattern(q), escape='\\')
+
+# Route to search students by name or email prefix
+@app.route('/search/students')
+def search_students():
+    q, limit = search_args()
+    rows = student_search_query(q).limit(limit).all()
+    return jsonify(results=[
+        dict(id=row.id, label=f'{row.name} ({row.email})', name=row.name, email=row.email) for row in rows
+    ])
+
+def student_search_query(q):
+    query = Student.query.with_entities(Student.id, Student.name, Student.email)
+    if q:
+        query = query.filter(or_(prefix_match(Student.name, q), prefix_match(Student.email, q)))
+    return query
+
+# Route to search meetings by id, date prefix (e.g. 2024-03), description prefix
+# or club name prefix
+@app.route('/search/meetings')
+def search_meetings():
+    q, limit = search_args()
+    query = db.session.query(Meetings.id, Meetings.date, Meetings.time, Meetings.description, Meetings.club_id)
+    if q:
+        # Dates are stored as ISO text, so a date prefix is a plain string range
+        date_text = type_coerce(Meetings.date, db.String)
+        matching_clubs = select(Club.id).where(prefix_match(Club.name, q))
+        conditions = [
+            and_(date_text >= q, date_text < q + '\uffff'),
+            prefix_match(Meetings.description, q),
+            Meetings.club_id.in_(matching_clubs),
+        ]
+        if q.isdigit():
+            conditions.append(Meetings.id == int(q))
+        query = query.filter(or_(*conditions))
+    # Order before the limit, so a long list of matches yields the earliest ones
+    rows = query.order_by(Meetings.date, Meetings.time, Meetings.id).limit(limit).all()
+    return jsonify(results=[
+        dict(id=row.id, label=f'{row.id}: {row.date} {row.time.strftime("%H:%M")} {row.description or ""}'.strip(),
+             date=row.date.isoformat(), time=row.time.strftime('%H:%M'), description=row.description,
+             club_id=row.club_id)
+        for row in rows
+    ])
+
+# Route to search clubs by name prefix
+@app.route('/search/clubs')
+def search_clubs():
+    q, limit = search_args()
+    query = Club.query.with_entities(Club.id, Club.name)
+    if q:
+        query = query.filter(prefix_match(Club.name, q))
+    rows = query.limit(limit).all()
+    return jsonify(results=[dict(id=row.id, label=row.name, name=row.name) for row in rows])
+
+# Route to search rooms by building or room number prefix
+@app.route('/search/rooms')
+def search_rooms():
+    q, limit = search_args()
+    query = Room.query.with_entities(Room.id, Room.building, Room.number, Room.max_capacity)
+    if q:
+        query = query.filter(or_(prefix_match(Room.building, q), prefix_match(Room.number, q)))
+    rows = query.limit(limit).all()
+    return jsonify(results=[
+        dict(id=row.id, label=f'{row.building} - {row.number}', building=row.building, number=row.number,
+             max_capacity=row.max_capacity)
+        for row in rows
+    ])
 
 
 # Route to input information needed to generate a report
 @app.route('/report')
 def report():
-    # Fetch all clubs and rooms to populate the form's dropdowns
-    clubs = Club.query.all()
-    rooms = Room.query.all()
-    default_reports = None
+    # Clubs and rooms for the form's dropdowns come from the reference cache
+    clubs = reference_cache.get('clubs')
+    rooms = reference_cache.get('rooms')
     return render_template('report.html', clubs=clubs, rooms=rooms)
 
+# Liveness probe: answers as long as the process can serve requests, without
+# touching the database
+@app.route('/healthz')
+def health():
+    return jsonify(status='ok')
+
+# Readiness probe: the database answers and is migrated to the latest schema
+# version, so a load balancer only routes to workers that can serve pages
+@app.route('/readyz')
+def readiness():
+    latest = SCHEMA_MIGRATIONS[-1][0]
+    try:
+        version = schema_version()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        logger.warning('Readiness check failed: %s', e)
+        return jsonify(status='unavailable', message='Database unavailable.'), 503
+    if version != latest:
+        return jsonify(status='unavailable', message=f'Schema version {version}, expected {latest}.'), 503
+    return jsonify(status='ready', schema_version=version)
+
+# Route to check how much load the reference cache is taking off the database
+@app.route('/stats/cache')
+def cache_stats():
+    return jsonify(reference=reference_cache.stats(), reports=report_cache.stats())
+
+# Route to inspect the profiles of the most recent requests, slowest statements included
+@app.route('/stats/requests')
+def request_stats():
+    with request_metrics.lock:
+        recent = list(request_metrics.recent)
+    return jsonify(requests=recent)
+
+# Route exposing request, SQL, template and cache metrics for Prometheus
+@app.route('/metrics')
+def metrics():
+    lines = request_metrics.prometheus()
+
+    lines += [
+        '# HELP clubhub_cache_hits_total Cache lookups answered without the database.',
+        '# TYPE clubhub_cache_hits_total counter',
+    ]
+    reference = reference_cache.stats()
+    reports = report_cache.stats()
+    for name, stats in reference.items():
+        lines.append(f'clubhub_cache_hits_total{{cache="{name}"}} {stats["hits"]}')
+    lines.append(f'clubhub_cache_hits_total{{cache="reports"}} {reports["hits"]}')
+    lines += [
+        '# HELP clubhub_cache_misses_total Cache lookups that went to the database.',
+        '# TYPE clubhub_cache_misses_total counter',
+    ]
+    for name, stats in reference.items():
+        lines.append(f'clubhub_cache_misses_total{{cache="{name}"}} {stats["misses"]}')
+    lines.append(f'clubhub_cache_misses_total{{cache="reports"}} {reports["misses"]}')
+
+    lines += notification_metrics.prometheus(notification_queue_depth())
+
+    return '\n'.join(lines) + '\n', 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
+# Query for the report rows of a date range, ordered by date and time. Each row
+# carries the meeting columns plus its invited/accepted counts read from the RSVP
+# rollup. With with_average the average duration over the whole filtered set is
+# attached to every row by a window function, so no second aggregate query is
+# needed. A blank club_id or room_id means "all".
+def report_query(start_date, end_date, club_id=None, room_id=None, with_average=True):
+    columns = [
+        Meetings.id,
+        Meetings.date,
+        Meetings.time,
+        Meetings.duration,
+        Meetings.description,
+        Meetings.club_id,
+        Meetings.room_id,
+        func.coalesce(MeetingRSVPCounts.invited_count, 0).label('invitedCount'),
+        func.coalesce(MeetingRSVPCounts.yes_count, 0).label('acceptedCount'),
+    ]
+    if with_average:
+        columns.append(func.avg(Meetings.duration).over().label('averageDuration'))
+
+    query = db.session.query(*columns).join(
+        MeetingRSVPCounts, MeetingRSVPCounts.meeting_id == Meetings.id, isouter=True
+    ).filter(
+        Meetings.date.between(start_date, end_date)
+    )
+
+    # Only constrain on club/room when one was chosen, so every combination is
+    # still answered by the same single statement
+    if club_id:
+        query = query.filter(Meetings.club_id == club_id)
+    if room_id:
+        query = query.filter(Meetings.room_id == room_id)
+
+    return query.order_by(Meetings.date, Meetings.time, Meetings.id)
+
+# Build the report for a date range in a single round trip
+def build_report(start_date, end_date, club_id=None, room_id=None):
+    rows = report_query(start_date, end_date, club_id, room_id).all()
+    average = rows[0].averageDuration if rows else None
+    return rows, average
+
+# Normalize report filter values (startDate, endDate, club_id, room_id) into the
+# (start_date, end_date, club_id, room_id) key shared by the report cache and
+# exports. Raises ValueError when the dates are missing or malformed.
+def parse_report_filter(values):
+    start_date = values.get('startDate')
+    end_date = values.get('endDate')
+    if not start_date or not end_date:
+        raise ValueError("Start and end dates are required.")
+    try:
+        return (
+            datetime.strptime(start_date, '%Y-%m-%d').date(),
+            datetime.strptime(end_date, '%Y-%m-%d').date(),
+            as_int(values.get('club_id', '')),
+            as_int(values.get('room_id', '')),
+        )
+    except ValueError:
+        raise ValueError("Invalid report filter.")
+
 # Route to generate a report based on meeting data
 @app.route('/generate_report', methods=['POST'])
 def generate_report():
-    # Use .get() to safely access form data, providing a fallback value as needed
-    start_date = request.form.get('startDate')
-    end_date = request.form.get('endDate')
-    club_id = request.form.get('club_id', '')
-    room_id = request.form.get('room_id', '')
-
-    # Ensure all required form data is provided
-    if not start_date or not end_date or not club_id or not room_id:
-        flash("All fields are required.", "error")
+    # The date range is required; club and room may be left blank for "all"
+    try:
+        key = parse_report_filter(request.form)
+    except ValueError as e:
+        flash(str(e), "error")
         return redirect(url_for('report'))
 
-    # Continue with filtering meetings based on the provided inputs
-    filtered_meetings = Meetings.query.filter(
-        Meetings.date.between(start_date, end_date),
-        Meetings.club_id == club_id,
-        Meetings.room_id == room_id
-    ).all()
+    # Serve repeated filters from the report cache unless the request opts out
+    # with a nocache field or a Cache-Control: no-cache header
+    bypass = request.values.get('nocache') or 'no-cache' in request.headers.get('Cache-Control', '')
+    cached, generation = (None, None) if bypass else report_cache.get(key, report_cache_db_generation(db.session))
+    if cached is None:
+        cached = build_report(*key)
+        if not bypass:
+            report_cache.put(key, cached, [row.id for row in cached[0]], generation)
+    meetings_data, average_duration = cached
 
-    # Aggregate data for invitedCount and acceptedCount
-    RSVPsAlias = aliased(RSVPs)
-    accepted_count = func.sum(case((RSVPsAlias.status == RSVPStatus.yes.name, 1), else_=0)).label('acceptedCount')
+    # Return the report results, with the filter kept for the export links
+    return render_template('report_results.html', meetings_data=meetings_data, average_duration=average_duration,
+                           report_filter=dict(startDate=key[0].isoformat(), endDate=key[1].isoformat(),
+                                              club_id=key[2] or '', room_id=key[3] or ''))
 
-    meetings_with_counts = db.session.query(
-        Meetings.id,
-        func.count(RSVPsAlias.student_id).label('invitedCount'),
-        accepted_count
-    ).join(RSVPsAlias, RSVPsAlias.meeting_id == Meetings.id, isouter=True).filter(
-        Meetings.date.between(start_date, end_date),
-        Meetings.club_id == club_id,
-        Meetings.room_id == room_id
-    ).group_by(Meetings.id).all()
-
-    # Calculate the average duration, if needed
-    average_duration = db.session.query(func.avg(Meetings.duration)).filter(
-        Meetings.date.between(start_date, end_date),
-        Meetings.club_id == club_id,
-        Meetings.room_id == room_id
-    ).scalar()
+# Rows fetched from the cursor per batch and written per response chunk by the
+# streaming exports
+EXPORT_BATCH_SIZE = 1000
+
+def export_value(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+# Stream a query as CSV or NDJSON. Rows are pulled from the cursor in batches
+# with yield_per and each batch is written out before the next is fetched, so
+# memory stays flat and the first bytes leave as soon as the first batch is read.
+def stream_export(query, filename, export_format):
+    if export_format not in ('csv', 'ndjson'):
+        return jsonify(message='format must be csv or ndjson.'), 400
+    query = query.execution_options(stream_results=True).yield_per(EXPORT_BATCH_SIZE)
+    fields = [column['name'] for column in query.column_descriptions]
+
+    def generate():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if export_format == 'csv' else None
+        if writer:
+            writer.writerow(fields)
+        pending = 0
+        for row in query:
+            values = [export_value(value) for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(fields, values))) + '\n')
+            pending += 1
+            if pending >= EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        yield buffer.getvalue()
+
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename={filename}.{export_format}'
+    })
+
+# Route to export a report's meeting rows:
+# /export/report?startDate=2024-01-01&endDate=2024-05-31&club_id=&room_id=&format=csv
+@app.route('/export/report')
+def export_report():
+    try:
+        key = parse_report_filter(request.args)
+    except ValueError as e:
+        return jsonify(message=str(e)), 400
+    # The windowed average would make SQLite read every row before the first one
+    # is returned, so exports leave it out
+    query = report_query(*key, with_average=False)
+    return stream_export(query, f'report_{key[0]}_{key[1]}', request.args.get('format', 'csv'))
+
+# Route to export RSVPs, optionally filtered by meeting_id, student_id and status
+@app.route('/export/rsvps')
+def export_rsvps():
+    try:
+        filters = rsvp_page_args(request.args)
+    except ValueError as e:
+        return jsonify(message=str(e)), 400
+
+    query = db.session.query(
+        RSVPs.meeting_id,
+        RSVPs.student_id,
+        Student.name.label('student_name'),
+        Student.email.label('student_email'),
+        RSVPs.status,
+        Meetings.date,
+        Meetings.time,
+        Meetings.club_id,
+        Meetings.room_id
+    ).join(Meetings, Meetings.id == RSVPs.meeting_id).join(Student, Student.id == RSVPs.student_id)
+    if 'meeting_id' in filters:
+        query = query.filter(RSVPs.meeting_id == filters['meeting_id'])
+    if 'student_id' in filters:
+        query = query.filter(RSVPs.student_id == filters['student_id'])
+    if 'status' in filters:
+        query = query.filter(RSVPs.status == filters['status'].name)
+    query = query.order_by(RSVPs.meeting_id, RSVPs.student_id)
+    return stream_export(query, 'rsvps', request.args.get('format', 'csv'))
+
+# Route to export meeting organizers, optionally for one meeting_id
+@app.route('/export/organizers')
+def export_organizers():
+    try:
+        meeting_id = as_int(request.args.get('meeting_id'))
+        student_id = as_int(request.args.get('student_id'))
+    except ValueError:
+        return jsonify(message='Invalid meeting_id or student_id.'), 400
+    return stream_export(organizers_query(meeting_id, student_id), 'organizers', request.args.get('format', 'csv'))
+
+# Organizers with their student and meeting details, ordered by meeting
+def organizers_query(meeting_id=None, student_id=None):
+    query = db.session.query(
+        MeetingOrganizers.meeting_id,
+        MeetingOrganizers.student_id,
+        Student.name.label('student_name'),
+        Student.email.label('student_email'),
+        Meetings.date,
+        Meetings.time,
+        Meetings.club_id
+    ).join(Meetings, Meetings.id == MeetingOrganizers.meeting_id).join(Student, Student.id == MeetingOrganizers.student_id)
+    if meeting_id is not None:
+        query = query.filter(MeetingOrganizers.meeting_id == meeting_id)
+    if student_id is not None:
+        query = query.filter(MeetingOrganizers.student_id == student_id)
+    return query.order_by(MeetingOrganizers.meeting_id, MeetingOrganizers.student_id)
+
+
+# SQLite expressions mapping a rollup day to the first day of its bucket; weeks
+# start on Monday
+ANALYTICS_BUCKETS = {
+    'day': lambda day: day,
+    'week': lambda day: func.date(day, 'weekday 0', '-6 days'),
+    'month': lambda day: func.strftime('%Y-%m-01', day),
+}
+
+# Route for dashboard analytics read from the daily rollup:
+# /analytics?start=2024-01-01&end=2024-12-31&bucket=month&group_by=club[&club_id=N]
+# Returns meeting counts, average duration, invitations and acceptance rate per
+# bucket, and per club or room when group_by is given. A query may group by or
+# filter on clubs or on rooms, not both, since each is its own rollup scope.
+@app.route('/analytics')
+def analytics():
+    try:
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
+        club_id = as_int(request.args.get('club_id'))
+        room_id = as_int(request.args.get('room_id'))
+    except (KeyError, ValueError):
+        return jsonify(message='start and end dates (YYYY-MM-DD) are required.'), 400
+    bucket = request.args.get('bucket', 'day')
+    group_by = request.args.get('group_by') or None
+    if bucket not in ANALYTICS_BUCKETS or group_by not in (None, 'club', 'room'):
+        return jsonify(message='bucket must be day, week or month and group_by club or room.'), 400
+    scopes = {group_by} - {None}
+    if club_id is not None:
+        scopes.add('club')
+    if room_id is not None:
+        scopes.add('room')
+    if len(scopes) > 1:
+        return jsonify(message='Group by or filter on clubs or on rooms, not both.'), 400
+    scope = scopes.pop() if scopes else 'all'
+    scope_value = club_id if scope == 'club' else room_id
 
-    # Re-fetch clubs and rooms for form dropdowns to preserve state
-    clubs = Club.query.all()
-    rooms = Room.query.all()
+    buckets = []
+    for row in analytics_query(start_date, end_date, bucket, scope, scope_value, group_by):
+        entry = dict(period=str(row.period), meetings=row.meetings,
+                     average_duration=round(row.total_minutes / row.meetings, 1) if row.meetings else None,
+                     invited=row.invited, yes=row.yes, no=row.no, maybe=row.maybe,
+                     acceptance_rate=round(row.yes / row.invited, 4) if row.invited else None)
+        if group_by:
+            entry[group_by + '_id'] = row.scope_id
+        buckets.append(entry)
+    return jsonify(start=start_date.isoformat(), end=end_date.isoformat(), bucket=bucket, group_by=group_by,
+                   buckets=buckets)
 
-    # Return the report results, including re-provided dropdown data
-    return render_template('report_results.html', clubs=clubs, rooms=rooms, meetings=filtered_meetings, meetings_data=meetings_with_counts, average_duration=average_duration)
+# Rollup rows of one scope summed per bucket, and per club or room with group_by
+def analytics_query(start_date, end_date, bucket, scope='all', scope_value=None, group_by=None):
+    period = ANALYTICS_BUCKETS[bucket](MeetingDailyStats.day).label('period')
+    keys = [period] + ([MeetingDailyStats.scope_id] if group_by else [])
+    query = db.session.query(
+        *keys,
+        func.sum(MeetingDailyStats.meeting_count).label('meetings'),
+        func.sum(MeetingDailyStats.total_minutes).label('total_minutes'),
+        func.sum(MeetingDailyStats.invited_count).label('invited'),
+        func.sum(MeetingDailyStats.yes_count).label('yes'),
+        func.sum(MeetingDailyStats.no_count).label('no'),
+        func.sum(MeetingDailyStats.maybe_count).label('maybe')
+    ).filter(
+        MeetingDailyStats.scope == scope,
+        MeetingDailyStats.day.between(start_date, end_date)
+    )
+    if scope_value is not None:
+        query = query.filter(MeetingDailyStats.scope_id == scope_value)
+    return query.group_by(*keys).order_by(*keys)
 
-# Run the Flask application
+# Run the Flask development server; wsgi.py is the production entry point
 if __name__ == '__main__':
     with app.app_context():
         initialize_database()
-    app.run(debug=True)
+    # The debug reloader runs this block in a watcher process and again in the
+    # serving child; only the child (WERKZEUG_RUN_MAIN set) drains the outbox
+    if app.config['NOTIFICATION_WORKER'] and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        notification_worker.start()
+    app.run(debug=True, port=int(os.environ.get('PORT', 5000)))
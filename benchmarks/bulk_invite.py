@@ -0,0 +1,62 @@
+# Benchmark the one-row "Send Invitation" form path against the bulk invite
+# endpoint. Run from the repository root:
+#   python -m benchmarks.bulk_invite --students 500
+import argparse
+import os
+import tempfile
+import time
+
+# Point the app at a throwaway database before it is imported
+db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(db_dir, 'bench.db')
+
+from app import app, db, Student, Meetings, RSVPs, initialize_database  # noqa: E402
+from datetime import date, time as dtime  # noqa: E402
+
+
+def seed(student_count):
+    with app.app_context():
+        initialize_database()
+        db.session.bulk_insert_mappings(Student, [
+            dict(name=f'Bench Student {i}', email=f'bench{i}@example.com')
+            for i in range(student_count)
+        ])
+        db.session.add_all([
+            Meetings(id=1, date=date(2024, 1, 8), time=dtime(18, 0), duration=60, description='per-row', club_id=1, room_id=1),
+            Meetings(id=2, date=date(2024, 1, 9), time=dtime(18, 0), duration=60, description='bulk', club_id=1, room_id=1),
+        ])
+        db.session.commit()
+        return [s.id for s in Student.query.all()]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students', type=int, default=500)
+    args = parser.parse_args()
+
+    student_ids = seed(args.students)
+    client = app.test_client()
+
+    # Per-row path: one POST, existence check, commit and page render per student
+    start = time.perf_counter()
+    for student_id in student_ids:
+        client.post('/invites_rsvps', data={'action': 'Send Invitation', 'meeting_id': 1, 'student_id': student_id})
+    per_row = time.perf_counter() - start
+
+    # Bulk path: one POST and one transaction for the whole list
+    start = time.perf_counter()
+    response = client.post('/invites_rsvps/bulk', json={'meeting_id': 2, 'student_ids': student_ids})
+    bulk = time.perf_counter() - start
+
+    with app.app_context():
+        per_row_count = RSVPs.query.filter_by(meeting_id=1).count()
+        bulk_count = RSVPs.query.filter_by(meeting_id=2).count()
+
+    print(f'students invited:   {len(student_ids)}')
+    print(f'per-row form path:  {per_row:.3f}s ({per_row_count} rows)')
+    print(f'bulk endpoint:      {bulk:.3f}s ({bulk_count} rows, {response.get_json()})')
+    print(f'speedup:            {per_row / bulk:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# Reproducible synthetic data for load testing. Rows are written with batched
+# executemany inserts in one transaction rather than one ORM object per row.
+# From the repository root:
+#   python -m benchmarks.generate_data --database /tmp/clubhub.db \
+#       --students 100000 --meetings 50000 --rsvps 5000000
+import argparse
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+
+# Meetings are placed in distinct one-hour slots so the generated schedule has
+# no room double bookings
+SEMESTER_START = date(2024, 1, 8)
+SEMESTER_DAYS = 112
+SLOT_HOURS = list(range(8, 21))
+BATCH_SIZE = 50000
+STATUS_WEIGHTS = (('yes', 0.45), ('no', 0.2), ('maybe', 0.35))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database', help='SQLite file to create (defaults to DATABASE_URL or the app database)')
+    parser.add_argument('--students', type=int, default=10000)
+    parser.add_argument('--clubs', type=int, default=200)
+    parser.add_argument('--rooms', type=int, default=300)
+    parser.add_argument('--meetings', type=int, default=5000)
+    parser.add_argument('--rsvps', type=int, default=100000)
+    parser.add_argument('--organizers-per-meeting', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=348)
+    return parser.parse_args(argv)
+
+
+def insert_batches(connection, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            connection.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        connection.execute(table.insert(), batch)
+
+
+def generate(students, clubs, rooms, meetings, rsvps, organizers_per_meeting=2, seed=348, log=print):
+    from app import app, db, Student, Club, Room, Meetings, MeetingOrganizers, RSVPs
+    from app import initialize_database, rebuild_rsvp_rollup
+
+    rng = random.Random(seed)
+    with app.app_context():
+        initialize_database()
+        started = time.perf_counter()
+        connection = db.session.connection()
+
+        # Ids continue after whatever rows the database already holds
+        def next_id(model):
+            return (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+
+        first_student, first_club, first_room, first_meeting = (
+            next_id(Student), next_id(Club), next_id(Room), next_id(Meetings)
+        )
+
+        insert_batches(connection, Student.__table__, (
+            dict(id=first_student + i, name=f'Student {i:06d}', email=f'student{i:06d}@example.edu')
+            for i in range(students)
+        ))
+        insert_batches(connection, Club.__table__, (
+            dict(id=first_club + i, name=f'Club {i:04d}', address=f'{i} Campus Way', description=f'Synthetic club {i}')
+            for i in range(clubs)
+        ))
+        insert_batches(connection, Room.__table__, (
+            dict(id=first_room + i, building=f'B{i % 40:02d}', number=str(100 + i), max_capacity=rng.randint(10, 300))
+            for i in range(rooms)
+        ))
+        log(f'{students} students, {clubs} clubs, {rooms} rooms')
+
+        slots_per_room = SEMESTER_DAYS * len(SLOT_HOURS)
+        if meetings > rooms * slots_per_room:
+            raise SystemExit(f'At most {rooms * slots_per_room} meetings fit in {rooms} rooms.')
+
+        def meeting_rows():
+            for i, slot in enumerate(rng.sample(range(rooms * slots_per_room), meetings)):
+                room_index, slot_index = divmod(slot, slots_per_room)
+                day, hour = divmod(slot_index, len(SLOT_HOURS))
+                start_at = datetime.combine(SEMESTER_START + timedelta(days=day), datetime.min.time()) \
+                    + timedelta(hours=SLOT_HOURS[hour])
+                duration = rng.choice((30, 45, 60))
+                yield dict(id=first_meeting + i, date=start_at.date(), time=start_at.time(), duration=duration,
+                           description=f'Meeting {i}', club_id=first_club + rng.randrange(clubs),
+                           room_id=first_room + room_index, start_at=start_at,
+                           end_at=start_at + timedelta(minutes=duration))
+        insert_batches(connection, Meetings.__table__, meeting_rows())
+        log(f'{meetings} meetings')
+
+        insert_batches(connection, MeetingOrganizers.__table__, (
+            dict(meeting_id=first_meeting + m, student_id=first_student + s)
+            for m in range(meetings)
+            for s in rng.sample(range(students), min(organizers_per_meeting, students))
+        ))
+
+        # Spread the RSVPs evenly; each meeting invites distinct students
+        statuses = [status for status, _ in STATUS_WEIGHTS]
+        weights = [weight for _, weight in STATUS_WEIGHTS]
+
+        def rsvp_rows():
+            per_meeting, remainder = divmod(rsvps, meetings) if meetings else (0, 0)
+            for m in range(meetings):
+                count = min(per_meeting + (1 if m < remainder else 0), students)
+                chosen = rng.sample(range(students), count)
+                for s, status in zip(chosen, rng.choices(statuses, weights, k=count)):
+                    yield dict(meeting_id=first_meeting + m, student_id=first_student + s, status=status)
+        insert_batches(connection, RSVPs.__table__, rsvp_rows())
+        db.session.commit()
+        log(f'{rsvps} RSVPs')
+
+        rebuild_rsvp_rollup()
+        db.session.execute(db.text('ANALYZE'))
+        db.session.commit()
+        log(f'Generated in {time.perf_counter() - started:.1f}s')
+
+
+def main():
+    args = parse_args()
+    if args.database:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(args.database)
+    generate(args.students, args.clubs, args.rooms, args.meetings, args.rsvps,
+             args.organizers_per_meeting, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+# Drive every page route through the Flask test client and report latency
+# percentiles, SQL statements per request and throughput, optionally comparing
+# against a stored baseline (benchmarks/baseline.json is the committed one; see
+# the README for what it covers). From the repository root:
+#   python -m benchmarks.load_test --requests 200 --save-baseline benchmarks/baseline.json
+#   python -m benchmarks.load_test --requests 200 --baseline benchmarks/baseline.json
+# Without --database a small synthetic database is generated in a temp dir.
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Each scenario returns the (method, path, form data) of its next request
+def build_scenarios(app, db, rng):
+    from app import Meetings, Student, Club, Room
+
+    with app.app_context():
+        meeting_ids = [row.id for row in db.session.query(Meetings.id).limit(5000)]
+        student_ids = [row.id for row in db.session.query(Student.id).limit(5000)]
+        club_ids = [row.id for row in db.session.query(Club.id)]
+        room_ids = [row.id for row in db.session.query(Room.id)]
+        next_meeting_id = (db.session.query(db.func.max(Meetings.id)).scalar() or 0) + 1
+
+    # New meetings go in the early morning of far-future days so they do not
+    # collide with the generated schedule or with each other
+    new_meetings = iter(range(next_meeting_id, next_meeting_id + 10 ** 7))
+
+    def add_meeting():
+        meeting_id = next(new_meetings)
+        day = date(2030, 1, 1) + timedelta(days=meeting_id % 3000)
+        return 'POST', '/add_edit_delete', dict(
+            action='Add_Edit', meetingID=meeting_id, meetingDate=day.isoformat(),
+            meetingTime=f'0{meeting_id % 7}:00', duration=30, description='load test',
+            club_id=rng.choice(club_ids), room_id=rng.choice(room_ids))
+
+    def organizer(action):
+        return lambda: ('POST', '/manage_organizers', dict(
+            action=action, meeting_id=rng.choice(meeting_ids), student_id=rng.choice(student_ids)))
+
+    def invitation():
+        return 'POST', '/invites_rsvps', dict(
+            action='Send Invitation', meeting_id=rng.choice(meeting_ids), student_id=rng.choice(student_ids))
+
+    def response():
+        return 'POST', '/invites_rsvps', dict(
+            action='Record Response', meeting_id=rng.choice(meeting_ids), student_id=rng.choice(student_ids),
+            rsvp_status=rng.choice(['yes', 'no', 'maybe']))
+
+    def report_month():
+        start = date(2024, 1, 1) + timedelta(days=30 * rng.randrange(4))
+        return 'POST', '/generate_report', dict(
+            startDate=start.isoformat(), endDate=(start + timedelta(days=30)).isoformat(),
+            club_id=rng.choice(club_ids + ['']), room_id='')
+
+    return {
+        'GET /add_edit_delete': lambda: ('GET', '/add_edit_delete', None),
+        'POST /add_edit_delete': add_meeting,
+        'GET /manage_organizers': lambda: ('GET', '/manage_organizers', None),
+        'POST /manage_organizers add': organizer('add'),
+        'POST /manage_organizers delete': organizer('delete'),
+        'GET /invites_rsvps': lambda: ('GET', '/invites_rsvps', None),
+        'POST /invites_rsvps invite': invitation,
+        'POST /invites_rsvps respond': response,
+        'GET /report': lambda: ('GET', '/report', None),
+        'POST /generate_report': report_month,
+    }
+
+
+def run(requests, seed):
+    from app import app, db
+    from sqlalchemy import event
+
+    rng = random.Random(seed)
+    scenarios = build_scenarios(app, db, rng)
+    client = app.test_client()
+
+    statements = [0]
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(*args):
+            statements[0] += 1
+
+    results = {}
+    for name, next_request in scenarios.items():
+        latencies, queries = [], []
+        started = time.perf_counter()
+        for _ in range(requests):
+            method, path, data = next_request()
+            statements[0] = 0
+            request_started = time.perf_counter()
+            response = client.open(path, method=method, data=data)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+            queries.append(statements[0])
+            if response.status_code >= 500:
+                raise SystemExit(f'{name} failed with {response.status_code}')
+        elapsed = time.perf_counter() - started
+        results[name] = dict(
+            p50_ms=round(percentile(latencies, 50), 3),
+            p95_ms=round(percentile(latencies, 95), 3),
+            p99_ms=round(percentile(latencies, 99), 3),
+            queries_per_request=round(statistics.mean(queries), 2),
+            requests_per_second=round(requests / elapsed, 1),
+        )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        # The absolute floors keep timer noise on sub-millisecond routes quiet
+        for metric, floor in (('p95_ms', 1.0), ('queries_per_request', 0.5)):
+            if current[metric] > previous[metric] * (1 + tolerance) and current[metric] - previous[metric] > floor:
+                regressions.append(f'{name}: {metric} {previous[metric]} -> {current[metric]}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database', help='Existing SQLite file to test against')
+    parser.add_argument('--requests', type=int, default=100, help='Requests per route')
+    parser.add_argument('--seed', type=int, default=348)
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--save-baseline', help='Write the results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed fractional increase in p95 latency or queries per request')
+    args = parser.parse_args()
+
+    if args.database:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.abspath(args.database)
+    else:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'load_test.db')
+        from benchmarks.generate_data import generate
+        generate(students=5000, clubs=50, rooms=100, meetings=2000, rsvps=50000, seed=args.seed, log=lambda _: None)
+
+    results = run(args.requests, args.seed)
+
+    print(f"{'route':32} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'req/s':>8}")
+    for name, result in results.items():
+        print(f"{name:32} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} {result['p99_ms']:8.2f} "
+              f"{result['queries_per_request']:8.2f} {result['requests_per_second']:8.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print('REGRESSION', regression)
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
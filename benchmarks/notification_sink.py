@@ -0,0 +1,63 @@
+# Local stand-in for the notification webhook. Prints every notification it
+# receives and can fail a share of them to exercise the worker's retries and
+# dead-lettering. From the repository root:
+#   python -m benchmarks.notification_sink --port 8025 --fail-rate 0.2
+# then run the app or `flask --app app notification-worker` with
+#   NOTIFICATION_BACKEND=webhook NOTIFICATION_WEBHOOK_URL=http://127.0.0.1:8025/notifications
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(fail_rate, delay, rng, counts, lock):
+    class NotificationSink(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+            if delay:
+                time.sleep(delay)
+            with lock:
+                failed = rng.random() < fail_rate
+                counts['failed' if failed else 'received'] += 1
+            if failed:
+                self.send_response(503)
+                self.end_headers()
+                return
+            message = json.loads(body or b'{}')
+            print(f"{message.get('id')} to={message.get('to')} subject={message.get('subject')}", flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+        # Print one line per notification instead of the default access log
+        def log_message(self, format, *args):
+            pass
+
+    return NotificationSink
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8025)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Share of requests answered with 503')
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to wait before answering')
+    parser.add_argument('--seed', type=int, default=348)
+    args = parser.parse_args()
+
+    counts = {'received': 0, 'failed': 0}
+    handler = make_handler(args.fail_rate, args.delay, random.Random(args.seed), counts, threading.Lock())
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f'Listening on http://{args.host}:{args.port}/notifications', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{counts['received']} received, {counts['failed']} failed", flush=True)
+
+
+if __name__ == '__main__':
+    main()
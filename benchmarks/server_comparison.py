@@ -0,0 +1,168 @@
+# Compare the development server (`python app.py`) with the production entry
+# point (`python wsgi.py`, and gunicorn when it is installed). Each server is
+# started as a subprocess against the same database and measured for:
+#   - cold start: launch until /readyz answers 200
+#   - first page: latency of the first /report, which needs the club and room lists
+#   - throughput and latency of concurrent GETs over a mix of page and API routes
+# From the repository root:
+#   python -m benchmarks.server_comparison --clients 16 --seconds 10 --workers 4 --threads 8
+# Without --database a synthetic database is generated in a temp dir.
+import argparse
+import os
+import random
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from importlib.util import find_spec
+
+from benchmarks.load_test import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def server_commands(workers, threads):
+    commands = {
+        'dev (python app.py)': [sys.executable, 'app.py'],
+        f'wsgi.py {workers}x{threads}': [sys.executable, 'wsgi.py', '--host', '127.0.0.1',
+                                         '--workers', str(workers), '--threads', str(threads)],
+    }
+    if find_spec('gunicorn'):
+        commands[f'gunicorn {workers}x{threads}'] = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                                                    'wsgi:application']
+    else:
+        print('gunicorn is not installed; skipping it', file=sys.stderr)
+    return commands
+
+
+# Paths drawn from the database so every route does real work
+def build_paths(database, rng):
+    connection = sqlite3.connect(database)
+    meeting_ids = [row[0] for row in connection.execute('SELECT id FROM meetings LIMIT 5000')]
+    first_day, last_day = connection.execute('SELECT min(date), max(date) FROM meetings').fetchone()
+    connection.close()
+
+    scenarios = [
+        lambda: '/report',
+        lambda: '/add_edit_delete',
+        lambda: f'/rsvps?meeting_id={rng.choice(meeting_ids)}&limit=20',
+        lambda: f'/search/students?q=Student+{rng.randrange(100):02d}',
+        lambda: f'/analytics?start={first_day}&end={last_day}&bucket=week',
+        lambda: f'/rooms/available?date={first_day}&time=10:00&duration=60',
+    ]
+    return lambda: rng.choice(scenarios)()
+
+
+def fetch(base, path):
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(base + path, timeout=30) as response:
+            response.read()
+            ok = response.status == 200
+    except (urllib.error.URLError, OSError):
+        ok = False
+    return ok, (time.perf_counter() - started) * 1000
+
+
+def wait_ready(base, process, timeout):
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise SystemExit(f'Server exited with status {process.returncode} before it was ready')
+        if fetch(base, '/readyz')[0]:
+            return time.perf_counter() - started
+        time.sleep(0.01)
+    raise SystemExit(f'Server not ready after {timeout}s')
+
+
+def load(base, next_path, clients, seconds):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            ok, elapsed = fetch(base, next_path())
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def measure(name, command, database, args):
+    port = free_port()
+    base = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, DATABASE_URL='sqlite:///' + database, PORT=str(port), WEB_HOST='127.0.0.1',
+               WEB_WORKERS=str(args.workers), WEB_THREADS=str(args.threads), NOTIFICATION_WORKER='0')
+    env.pop('WEB_ACCESS_LOG', None)
+    # The dev server's reloader forks a child, so the whole session is stopped
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                               start_new_session=True)
+    try:
+        cold_start = wait_ready(base, process, args.timeout)
+        ok, first_page = fetch(base, '/report')
+        if not ok:
+            raise SystemExit(f'{name}: first /report failed')
+        latencies, errors = load(base, build_paths(database, random.Random(args.seed)), args.clients, args.seconds)
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+    return dict(cold_start_s=cold_start, first_page_ms=first_page, requests_per_second=len(latencies) / args.seconds,
+                p50_ms=percentile(latencies, 50) if latencies else 0,
+                p95_ms=percentile(latencies, 95) if latencies else 0, errors=errors)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--database', help='Existing SQLite file to serve')
+    parser.add_argument('--clients', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--seconds', type=float, default=10, help='Load duration per server')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds to wait for a server to become ready')
+    parser.add_argument('--seed', type=int, default=348)
+    args = parser.parse_args()
+
+    if args.database:
+        database = os.path.abspath(args.database)
+    else:
+        database = os.path.join(tempfile.mkdtemp(), 'server_comparison.db')
+        os.environ['DATABASE_URL'] = 'sqlite:///' + database
+        from benchmarks.generate_data import generate
+        generate(students=20000, clubs=100, rooms=200, meetings=10000, rsvps=200000, seed=args.seed,
+                 log=lambda _: None)
+
+    print(f"{'server':24} {'cold start s':>12} {'first page ms':>13} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'errors':>6}")
+    for name, command in server_commands(args.workers, args.threads).items():
+        result = measure(name, command, database, args)
+        print(f"{name:24} {result['cold_start_s']:12.2f} {result['first_page_ms']:13.2f} "
+              f"{result['requests_per_second']:8.1f} {result['p50_ms']:8.2f} {result['p95_ms']:8.2f} "
+              f"{result['errors']:6}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
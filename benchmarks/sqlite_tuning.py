@@ -0,0 +1,84 @@
+# Compare concurrent write throughput with the driver's default SQLite settings
+# against the tuned engine (WAL, pragmas, busy timeout and connection pool).
+# Each mode runs in its own process on a fresh database. From the repository
+# root:
+#   python -m benchmarks.sqlite_tuning --threads 8 --writes 200
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+MODES = {
+    'default': {'SQLITE_TUNING': '0'},
+    'tuned': {'SQLITE_TUNING': '1'},
+}
+
+
+def run_worker(threads, writes):
+    from app import app, db, Meetings, initialize_database
+    from datetime import date, time as dtime
+
+    with app.app_context():
+        initialize_database()
+
+    errors = []
+
+    # Each thread commits one meeting per transaction, the same shape as the
+    # add_edit_delete form
+    def writer(thread_index):
+        with app.app_context():
+            for i in range(writes):
+                try:
+                    db.session.add(Meetings(date=date(2024, 1, 1), time=dtime(9, 0), duration=60,
+                                            description=f'bench {thread_index}-{i}', club_id=1, room_id=1))
+                    db.session.commit()
+                except Exception as e:
+                    db.session.rollback()
+                    errors.append(str(e).splitlines()[0])
+            db.session.remove()
+
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    committed = threads * writes - len(errors)
+    print(f'{committed} {len(errors)} {elapsed:.4f}')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--writes', type=int, default=200)
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.threads, args.writes)
+        return
+
+    results = {}
+    for mode, env in MODES.items():
+        db_path = os.path.join(tempfile.mkdtemp(), 'bench.db')
+        child_env = dict(os.environ, DATABASE_URL='sqlite:///' + db_path, **env)
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_tuning', '--worker',
+             '--threads', str(args.threads), '--writes', str(args.writes)],
+            env=child_env, capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+        committed, failed, elapsed = output.split()
+        results[mode] = (int(committed), int(failed), float(elapsed))
+
+    print(f'{args.threads} threads x {args.writes} single-row commits')
+    for mode, (committed, failed, elapsed) in results.items():
+        print(f'{mode:8} {committed / elapsed:9.1f} commits/s  {failed} failed  {elapsed:.2f}s')
+
+
+if __name__ == '__main__':
+    main()
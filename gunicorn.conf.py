@@ -0,0 +1,24 @@
+# gunicorn settings for the production entry point:
+#   gunicorn -c gunicorn.conf.py wsgi:application
+# Reads the same WEB_HOST, PORT, WEB_WORKERS, WEB_THREADS and WEB_ACCESS_LOG
+# as `python wsgi.py`; WEB_ACCESS_LOG=- logs requests to stdout.
+import os
+
+bind = f"{os.environ.get('WEB_HOST', '0.0.0.0')}:{os.environ.get('PORT', 8000)}"
+workers = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1))
+threads = int(os.environ.get('WEB_THREADS', 8))
+worker_class = 'gthread'
+# Import wsgi.py in the master, so migrations and cache warm-up run once and
+# the workers are forked with warm caches. app.py drops inherited SQLite
+# connections in each forked worker.
+preload_app = True
+accesslog = os.environ.get('WEB_ACCESS_LOG') or None
+
+
+# Threads do not survive fork, so each worker starts its own outbox dispatcher;
+# the claim UPDATE keeps them from sending the same notification twice
+def post_fork(server, worker):
+    from app import app, notification_worker
+
+    if app.config['NOTIFICATION_WORKER']:
+        notification_worker.start()
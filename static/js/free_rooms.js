@@ -0,0 +1,27 @@
+// Replace the room dropdown on the meeting form with the rooms that are free for
+// the chosen date, time and duration, tightest capacity fit first.
+document.getElementById('findFreeRooms').addEventListener('click', function () {
+    var status = document.getElementById('freeRoomsStatus');
+    var params = new URLSearchParams({
+        date: document.getElementById('meetingDate').value,
+        time: document.getElementById('meetingTime').value,
+        duration: document.getElementById('duration').value,
+        min_capacity: document.getElementById('minCapacity').value || 0
+    });
+    fetch('/rooms/available?' + params.toString())
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+            if (!data.rooms) {
+                status.textContent = data.message;
+                return;
+            }
+            var select = document.getElementById('room_id');
+            select.replaceChildren.apply(select, data.rooms.map(function (room) {
+                var option = document.createElement('option');
+                option.value = room.id;
+                option.textContent = room.label + ' (' + room.max_capacity + ' seats)';
+                return option;
+            }));
+            status.textContent = data.rooms.length ? '' : 'No free rooms for that time.';
+        });
+});
@@ -0,0 +1,23 @@
+// Fill the <datalist> of every input with a data-search attribute from the
+// matching /search endpoint as the user types, instead of shipping every row
+// of the table inside a <select>.
+document.querySelectorAll('input[data-search]').forEach(function (input) {
+    var timer;
+    input.addEventListener('input', function () {
+        clearTimeout(timer);
+        timer = setTimeout(function () {
+            var url = input.dataset.search + '?limit=10&q=' + encodeURIComponent(input.value);
+            fetch(url)
+                .then(function (response) { return response.json(); })
+                .then(function (data) {
+                    var list = document.getElementById(input.getAttribute('list'));
+                    list.replaceChildren.apply(list, data.results.map(function (result) {
+                        var option = document.createElement('option');
+                        option.value = result.id;
+                        option.label = result.label;
+                        return option;
+                    }));
+                });
+        }, 150);
+    });
+});
@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+from datetime import date, time
+
+import pytest
+
+# app.py reads DATABASE_URL at import time, so point it at a throwaway file
+# before any test imports the app
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'test.db')
+os.environ.setdefault('NOTIFICATION_WORKER', '0')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import Meetings, app, db, initialize_database  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def migrated():
+    with app.app_context():
+        initialize_database()
+        yield
+
+
+@pytest.fixture
+def client(migrated):
+    return app.test_client()
+
+
+# A new meeting of the first seeded club in the first seeded room
+@pytest.fixture
+def meeting(migrated):
+    meeting = Meetings(date=date(2030, 3, 4), time=time(18, 0), duration=60, description='Test meeting',
+                       club_id=1, room_id=1)
+    db.session.add(meeting)
+    db.session.commit()
+    return meeting
@@ -0,0 +1,29 @@
+import pytest
+
+from app import Meetings, db
+
+
+def save_meeting(client, **overrides):
+    form = dict(action='save', meetingID='9001', meetingDate='2030-05-06', meetingTime='10:00', duration='30',
+                description='Booking check', club_id='1', room_id='2')
+    form.update(overrides)
+    return client.post('/add_edit_delete', data=form)
+
+
+@pytest.mark.parametrize('field, value, message', [
+    ('meetingID', 'abc', b'Meeting ID must be a whole number.'),
+    ('room_id', 'abc', b'Room must be chosen from the list.'),
+    ('club_id', 'abc', b'Club must be chosen from the list.'),
+    ('duration', 'long', b'Duration must be a whole number of minutes.'),
+])
+def test_non_numeric_fields_are_form_errors(client, migrated, field, value, message):
+    response = save_meeting(client, **{field: value})
+    assert response.status_code == 200
+    assert message in response.data
+    assert db.session.get(Meetings, 9001) is None
+
+
+def test_valid_booking_is_saved(client, migrated):
+    response = save_meeting(client, meetingID='9002')
+    assert b'Meeting added successfully!' in response.data
+    assert db.session.get(Meetings, 9002).club_id == 1
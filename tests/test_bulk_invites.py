@@ -0,0 +1,57 @@
+import io
+import json
+
+import pytest
+
+from app import RSVPs
+
+
+def post_json(client, body):
+    return client.post('/invites_rsvps/bulk', data=body, content_type='application/json')
+
+
+def post_file(client, meeting, filename, content):
+    return client.post('/invites_rsvps/bulk', content_type='multipart/form-data', data=dict(
+        meeting_id=str(meeting.id), student_file=(io.BytesIO(content.encode()), filename)))
+
+
+def test_json_body_invites_listed_students(client, meeting):
+    response = post_json(client, json.dumps(dict(meeting_id=meeting.id, student_ids=[2, 3])))
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 2
+    assert sorted(r.student_id for r in RSVPs.query.filter_by(meeting_id=meeting.id)) == [2, 3]
+
+
+@pytest.mark.parametrize('student_ids', ['23', [1.9], [True], [2, '3'], 5, None])
+def test_json_body_rejects_ids_that_are_not_a_list_of_ints(client, meeting, student_ids):
+    response = post_json(client, json.dumps(dict(meeting_id=meeting.id, student_ids=student_ids)))
+    assert response.status_code == 400
+    assert RSVPs.query.filter_by(meeting_id=meeting.id).count() == 0
+
+
+@pytest.mark.parametrize('body', ['{not json', '[1, 2]', '"23"'])
+def test_json_body_that_is_not_an_object_is_rejected(client, body):
+    assert post_json(client, body).status_code == 400
+
+
+@pytest.mark.parametrize('content', ['{"student_ids": "23"}', '{"student_ids": 5}', '[1.9]', '"23"', '{broken'])
+def test_json_upload_rejects_ids_that_are_not_a_list_of_ints(client, meeting, content):
+    assert post_file(client, meeting, 'ids.json', content).status_code == 400
+    assert RSVPs.query.filter_by(meeting_id=meeting.id).count() == 0
+
+
+def test_json_upload_accepts_a_bare_list(client, meeting):
+    response = post_file(client, meeting, 'ids.json', '[1, 2]')
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 2
+
+
+def test_csv_upload_reads_the_student_id_column(client, meeting):
+    response = post_file(client, meeting, 'ids.csv', 'name,student_id\nJohn,1\n\nJane,2\n')
+    assert response.status_code == 200
+    assert response.get_json()['inserted'] == 2
+
+
+def test_csv_upload_with_a_short_row_is_rejected(client, meeting):
+    assert post_file(client, meeting, 'ids.csv', 'name,student_id\nbob\n').status_code == 400
+    assert RSVPs.query.filter_by(meeting_id=meeting.id).count() == 0
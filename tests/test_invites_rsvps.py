@@ -0,0 +1,29 @@
+import pytest
+
+from app import RSVPStatus, RSVPs, bulk_invite, db
+
+
+@pytest.fixture
+def invited(meeting):
+    bulk_invite(meeting.id, [1])
+    return meeting
+
+
+def record_response(client, meeting, **form):
+    return client.post('/invites_rsvps', data=dict(action='Record Response', meeting_id=str(meeting.id),
+                                                   student_id='1', **form), follow_redirects=True)
+
+
+@pytest.mark.parametrize('form', [{}, dict(rsvp_status=''), dict(rsvp_status='perhaps')])
+def test_record_response_without_a_valid_status_is_a_form_error(client, invited, form):
+    response = record_response(client, invited, **form)
+    assert response.status_code == 200
+    assert b'Choose a response' in response.data
+    assert db.session.get(RSVPs, (invited.id, 1)).status == RSVPStatus.maybe
+
+
+def test_record_response_updates_the_status(client, invited):
+    response = record_response(client, invited, rsvp_status='Yes')
+    assert b'RSVP response recorded!' in response.data
+    db.session.expire_all()
+    assert db.session.get(RSVPs, (invited.id, 1)).status == RSVPStatus.yes
@@ -0,0 +1,29 @@
+from sqlalchemy import text
+
+from app import check_query_plans, db
+
+
+# Every hot-path query must be answered from an index on a freshly migrated
+# database
+def test_hot_path_queries_do_not_scan(migrated):
+    results = check_query_plans()
+    assert results
+    failures = {name: scans for name, plan, scans in results if scans}
+    assert failures == {}
+
+
+# The check itself has to notice a missing index
+def test_missing_index_is_reported(migrated):
+    connection = db.session.connection()
+    sql = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_meeting_organizers_student'"
+    )).scalar()
+    assert sql
+    connection.execute(text('DROP INDEX idx_meeting_organizers_student'))
+    db.session.commit()
+    try:
+        scans = {name: scans for name, plan, scans in check_query_plans()}
+        assert scans['organizers for a student']
+    finally:
+        db.session.execute(text(sql))
+        db.session.commit()
@@ -0,0 +1,68 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app import Meetings, bump_report_cache_generation, db, report_cache
+
+
+# A meeting, and a report over its week and one over the week after
+@pytest.fixture
+def reports(migrated):
+    meeting = Meetings(date=date(2032, 6, 8), time=time(12, 0), duration=30, club_id=1, room_id=1)
+    db.session.add(meeting)
+    db.session.commit()
+    report_cache.entries.clear()
+    return meeting, dict(startDate='2032-06-07', endDate='2032-06-13'), dict(startDate='2032-06-14',
+                                                                            endDate='2032-06-20')
+
+
+def generate(client, form):
+    response = client.post('/generate_report', data=form)
+    assert response.status_code == 200
+    return response
+
+
+def misses():
+    return report_cache.stats()['misses']
+
+
+def test_repeated_report_is_served_from_the_cache(client, reports):
+    _, week, _ = reports
+    generate(client, week)
+    before = misses()
+    generate(client, week)
+    assert misses() == before
+
+
+def test_meeting_write_drops_only_the_reports_covering_it(client, reports):
+    _, week, next_week = reports
+    generate(client, week)
+    generate(client, next_week)
+
+    added = Meetings(date=date(2032, 6, 9), time=time(12, 0), duration=30, club_id=1, room_id=1)
+    db.session.add(added)
+    db.session.commit()
+
+    before = misses()
+    assert f'<td>{added.id}</td>'.encode() in generate(client, week).data
+    assert misses() == before + 1
+    generate(client, next_week)
+    assert misses() == before + 1
+
+
+def test_generation_bumped_by_another_session_drops_the_cache(client, reports):
+    _, week, next_week = reports
+    generate(client, week)
+    generate(client, next_week)
+
+    # Stands in for a commit made by another worker process, which this
+    # process's session hooks never see
+    with Session(db.engine) as other:
+        bump_report_cache_generation(other)
+        other.commit()
+
+    before = misses()
+    generate(client, week)
+    generate(client, next_week)
+    assert misses() == before + 2
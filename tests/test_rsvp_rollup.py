@@ -0,0 +1,106 @@
+import json
+from datetime import date, time
+
+import pytest
+from sqlalchemy import text
+
+from app import (IdempotencyKeys, MeetingDailyStats, Meetings, RSVPStatus, RSVPs, apply_rsvp_responses, db,
+                 rebuild_rsvp_rollup, refresh_daily_stats)
+
+DAILY_STATS_COLUMNS = ('day', 'scope', 'scope_id', 'meeting_count', 'total_minutes',
+                       'invited_count', 'yes_count', 'no_count', 'maybe_count')
+
+
+def daily_stats():
+    return sorted(
+        tuple(getattr(row, name) for name in DAILY_STATS_COLUMNS)
+        for row in MeetingDailyStats.query
+    )
+
+
+def respond(client, *responses, key=None):
+    body = json.dumps(dict(responses=[dict(meeting_id=m, student_id=s, status=status)
+                                      for m, s, status in responses]))
+    headers = {'Idempotency-Key': key} if key else {}
+    return client.post('/rsvps/responses', data=body, content_type='application/json', headers=headers)
+
+
+# Two meetings on different days, clubs and rooms, written through the app
+@pytest.fixture
+def meetings(migrated):
+    first = Meetings(date=date(2031, 1, 6), time=time(9, 0), duration=45, club_id=1, room_id=1)
+    second = Meetings(date=date(2031, 1, 7), time=time(9, 0), duration=90, club_id=2, room_id=2)
+    db.session.add_all([first, second])
+    db.session.commit()
+    return first, second
+
+
+def test_rollups_match_a_rebuild_after_mixed_writes(client, meetings):
+    first, second = meetings
+    for meeting in meetings:
+        response = client.post('/invites_rsvps/bulk', data=json.dumps(dict(meeting_id=meeting.id,
+                                                                           student_ids=[1, 2, 3])),
+                               content_type='application/json')
+        assert response.status_code == 200
+
+    assert respond(client, (first.id, 1, 'yes'), (first.id, 2, 'no'), (second.id, 3, 'yes')).status_code == 200
+
+    # A legacy row with a NULL status counts as invited only
+    db.session.execute(text('DELETE FROM rsv_ps WHERE meeting_id = :m AND student_id = 2'), dict(m=second.id))
+    db.session.execute(text('INSERT INTO rsv_ps (meeting_id, student_id, status) VALUES (:m, 2, NULL)'),
+                       dict(m=second.id))
+    db.session.commit()
+    rebuild_rsvp_rollup()
+    refresh_daily_stats(db.session)
+    db.session.commit()
+    assert respond(client, (second.id, 2, 'maybe')).status_code == 200
+
+    # Responding to one legacy row and deleting another
+    db.session.execute(text('UPDATE rsv_ps SET status = NULL WHERE meeting_id = :m AND student_id = 1'),
+                       dict(m=second.id))
+    db.session.commit()
+    rebuild_rsvp_rollup()
+    refresh_daily_stats(db.session)
+    db.session.commit()
+    response = client.post('/invites_rsvps', data=dict(action='Delete RSVP', meeting_id=str(second.id),
+                                                       student_id='1'))
+    assert response.status_code == 200
+    client.post('/invites_rsvps', data=dict(action='Delete RSVP', meeting_id=str(first.id), student_id='3'))
+
+    # Moving a meeting to another day
+    response = client.post('/add_edit_delete', data=dict(
+        action='save', meetingID=str(first.id), meetingDate='2031-01-09', meetingTime='09:00', duration='45',
+        description='', club_id='1', room_id='1'))
+    assert b'Meeting updated successfully!' in response.data
+
+    db.session.expire_all()
+    assert RSVPs.query.filter_by(meeting_id=second.id).count() == 2
+    assert rebuild_rsvp_rollup(fix=False) == []
+    incremental = daily_stats()
+    refresh_daily_stats(db.session)
+    assert incremental == daily_stats()
+    db.session.rollback()
+
+
+def test_replayed_idempotency_key_does_not_write_again(client, meetings):
+    first, _ = meetings
+    client.post('/invites_rsvps/bulk', data=json.dumps(dict(meeting_id=first.id, student_ids=[1])),
+                content_type='application/json')
+
+    response = respond(client, (first.id, 1, 'yes'), key='replay-test')
+    assert response.status_code == 200
+    assert response.get_json()['updated'] == 1
+
+    # Change the RSVP behind the stored response; a replay must not undo it
+    apply_rsvp_responses([(first.id, 1, RSVPStatus.no)])
+    db.session.commit()
+
+    replay = respond(client, (first.id, 1, 'yes'), key='replay-test')
+    assert replay.status_code == 200
+    assert replay.headers['Idempotent-Replayed'] == 'true'
+    assert replay.get_json() == response.get_json()
+    db.session.expire_all()
+    assert db.session.get(RSVPs, (first.id, 1)).status == RSVPStatus.no
+    assert IdempotencyKeys.query.filter_by(key='replay-test').count() == 1
+
+    assert respond(client, (first.id, 1, 'maybe'), key='replay-test').status_code == 422
@@ -0,0 +1,15 @@
+from datetime import date, time
+
+from app import Meetings, db
+
+
+# More matches than the limit: the earliest meetings are returned, in order,
+# whatever order they were inserted in
+def test_meeting_search_returns_the_earliest_matches(client, migrated):
+    days = [date(2033, 2, day) for day in (20, 3, 14, 1, 9, 27, 5)]
+    db.session.add_all([Meetings(date=day, time=time(8, 0), duration=30, description='Search order')
+                        for day in days])
+    db.session.commit()
+
+    results = client.get('/search/meetings', query_string=dict(q='Search order', limit=3)).get_json()['results']
+    assert [row['date'] for row in results] == ['2033-02-01', '2033-02-03', '2033-02-05']
@@ -0,0 +1,198 @@
+# Production entry point. Importing this module migrates and seeds the
+# database and warms the caches once, then exposes the app as `application`.
+# With gunicorn (see gunicorn.conf.py, which preloads the app so this runs in
+# the master before it forks):
+#   gunicorn -c gunicorn.conf.py wsgi:application
+# Without gunicorn, this module runs the same pre-fork model on the standard
+# library and Werkzeug:
+#   python wsgi.py --workers 4 --threads 8 --port 8000
+# Workers, threads, host and port default to WEB_WORKERS, WEB_THREADS,
+# WEB_HOST and PORT; setting WEB_ACCESS_LOG logs every request.
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler
+
+from app import app, db, initialize_database, warm_up, notification_worker
+
+WEB_HOST = os.environ.get('WEB_HOST', '0.0.0.0')
+WEB_PORT = int(os.environ.get('PORT', 8000))
+WEB_WORKERS = int(os.environ.get('WEB_WORKERS', os.cpu_count() or 1))
+WEB_THREADS = int(os.environ.get('WEB_THREADS', 8))
+# A worker that exits this soon after starting is failing on startup, so the
+# server stops instead of respawning it in a loop
+WORKER_MIN_UPTIME_SECONDS = 1
+
+
+def prepare():
+    with app.app_context():
+        initialize_database()
+        warm_up()
+        # Close the parent's connections so no worker ever starts with one
+        db.session.remove()
+        db.engine.dispose()
+
+
+prepare()
+application = app
+
+
+# Werkzeug server that hands each connection to a fixed pool of threads instead
+# of starting a thread per request. A worker only accepts a connection once one
+# of its threads is free, so it never holds more connections than it has
+# threads; the rest wait in the shared listen backlog for an idle worker.
+class PooledWSGIServer(BaseWSGIServer):
+    multithread = True
+
+    def __init__(self, host, port, app, threads, fd=None, handler=None):
+        super().__init__(host, port, app, handler=handler, fd=fd)
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='wsgi')
+        self.free_threads = threading.BoundedSemaphore(threads)
+
+    def get_request(self):
+        self.free_threads.acquire()
+        try:
+            return super().get_request()
+        except BaseException:
+            self.free_threads.release()
+            raise
+
+    # socketserver closes every accepted connection through here exactly once,
+    # whether it was served, failed or rejected
+    def shutdown_request(self, request):
+        try:
+            super().shutdown_request(request)
+        finally:
+            self.free_threads.release()
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def process_request_thread(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+# Requests are counted by /metrics; one log line per request would only slow
+# the worker down
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def stop_worker(signum, frame):
+    raise SystemExit(0)
+
+
+# Body of a forked worker. It always ends in os._exit, so a failure anywhere,
+# including while the server is being set up, can never return into the
+# parent's loop in serve() and leave two processes spawning workers.
+def run_worker(listener, host, port, threads, access_log):
+    status = 1
+    try:
+        signal.signal(signal.SIGTERM, stop_worker)
+        signal.signal(signal.SIGINT, stop_worker)
+        serve_worker(listener, host, port, threads, access_log)
+        status = 0
+    except SystemExit:
+        status = 0
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(status)
+
+
+def serve_worker(listener, host, port, threads, access_log):
+    server = PooledWSGIServer(host, port, application, threads, fd=listener.fileno(),
+                              handler=None if access_log else QuietRequestHandler)
+    try:
+        if app.config['NOTIFICATION_WORKER']:
+            notification_worker.start()
+        server.serve_forever()
+    except SystemExit:
+        pass
+    finally:
+        # Let in-flight requests finish, ignoring the repeated signals a
+        # Ctrl-C sends to the whole process group
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        server.pool.shutdown(wait=True)
+        notification_worker.stop(5)
+        server.server_close()
+
+
+# Bind once in the parent, fork the workers to accept on the shared socket and
+# respawn any that die until the server is told to stop
+def serve(host, port, workers, threads, access_log=False):
+    listener = socket.create_server((host, port), family=socket.AF_INET6 if ':' in host else socket.AF_INET,
+                                    backlog=2048)
+    children = {}
+    stopping = []
+
+    def spawn(index):
+        pid = os.fork()
+        if pid == 0:
+            run_worker(listener, host, port, threads, access_log)
+        children[pid] = (index, time.monotonic())
+
+    def stop(signum, frame):
+        stopping.append(signum)
+        for pid in children:
+            # os.wait() may have reaped it already, just before it is
+            # removed from children
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for index in range(workers):
+        spawn(index)
+    print(f'Serving on http://{host}:{port} with {workers} worker(s) x {threads} thread(s)', flush=True)
+
+    while children:
+        pid, status = os.wait()
+        index, started = children.pop(pid)
+        if stopping:
+            continue
+        if time.monotonic() - started < WORKER_MIN_UPTIME_SECONDS:
+            print(f'Worker {index} exited with status {status} during startup; stopping', file=sys.stderr, flush=True)
+            stop(None, None)
+            continue
+        print(f'Worker {index} exited with status {status}; respawning', file=sys.stderr, flush=True)
+        spawn(index)
+    listener.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--host', default=WEB_HOST)
+    parser.add_argument('--port', type=int, default=WEB_PORT)
+    parser.add_argument('--workers', type=int, default=WEB_WORKERS, help='Worker processes')
+    parser.add_argument('--threads', type=int, default=WEB_THREADS, help='Request threads per worker')
+    parser.add_argument('--access-log', action='store_true', default=bool(os.environ.get('WEB_ACCESS_LOG')),
+                        help='Log every request')
+    args = parser.parse_args()
+
+    if not args.access_log:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    serve(args.host, args.port, max(args.workers, 1), max(args.threads, 1), args.access_log)
+
+
+if __name__ == '__main__':
+    main()